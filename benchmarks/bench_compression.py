@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import base64
+from functools import partial
+
+from benchmarks import harness
+from vial.compression import DEFAULT_COMPRESSORS, Compressor, load_compressor
+from vial.json import NativeJson
+
+PAYLOAD_SIZES = (10, 100, 1000)
+
+
+def build_payload(count: int) -> bytes:
+    items = [{"id": i, "name": f"Item {i}", "price": i * 1.25, "tags": ["new", "sale"]} for i in range(count)]
+    return NativeJson.dumps(items).encode("utf-8")
+
+
+def build_compressors() -> dict[str, Compressor]:
+    compressors = dict(DEFAULT_COMPRESSORS)
+    for level in (1, 9):
+        if compressor := load_compressor("gzip", compresslevel=level):
+            compressors[f"gzip (level {level})"] = compressor
+    return compressors
+
+
+def main() -> None:
+    rows = []
+    for count in PAYLOAD_SIZES:
+        payload = build_payload(count)
+        for name, compressor in build_compressors().items():
+            compressed = base64.b64encode(compressor(payload))
+            cost = harness.measure(partial(compressor, payload), number=50)
+            rows.append([f"{count} items", name, len(payload), len(compressed), len(compressed) / len(payload), cost])
+    headers = ["payload", "encoding", "raw bytes", "base64 bytes", "ratio", "us"]
+    harness.report("Response compression, CPU vs transferred bytes", headers, rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable
+
+from benchmarks import harness
+from vial.json import NativeJson, to_dict
+
+
+@dataclass
+class Address:
+    street: str
+    city: str
+    country: str
+
+
+@dataclass
+class User:
+    user_id: int
+    name: str
+    email: str
+    addresses: list[Address]
+
+
+class AsdictEncoder(json.JSONEncoder):
+    def default(self, o: Any) -> Any:
+        return dataclasses.asdict(o)
+
+
+def build_users(count: int) -> list[User]:
+    address = Address("1 Main St", "Springfield", "US")
+    return [User(i, f"User {i}", f"user-{i}@example.com", [address, address]) for i in range(count)]
+
+
+def main() -> None:
+    users = build_users(1000)
+    rows = [
+        [
+            "convert (1000 users)",
+            harness.measure(partial(convert, dataclasses.asdict, users), number=20),
+            harness.measure(partial(convert, to_dict, users), number=20),
+        ],
+        [
+            "dumps (1000 users)",
+            harness.measure(partial(json.dumps, users, cls=AsdictEncoder), number=20),
+            harness.measure(partial(NativeJson.dumps, users), number=20),
+        ],
+    ]
+    harness.report("Dataclass serialization (us)", ["operation", "dataclasses.asdict", "vial.json.to_dict"], rows)
+
+
+def convert(converter: Callable[[Any], dict[str, Any]], users: list[User]) -> list[dict[str, Any]]:
+    return [converter(user) for user in users]
+
+
+if __name__ == "__main__":
+    main()
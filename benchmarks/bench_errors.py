@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from functools import partial
+from http import HTTPStatus
+from typing import Type
+
+from benchmarks import harness
+from vial.errors import ErrorHandler, Handler
+from vial.exceptions import NotFoundError, VialError
+from vial.types import Response
+
+
+class UncachedErrorHandler(ErrorHandler):
+    """Walks the exception MRO on every error, the way handlers were resolved before they were cached."""
+
+    def get_handler(self, resource: str, error_type: Type[Exception]) -> Handler:
+        return self._resolve_handler(resource, error_type)
+
+    def _get_native_status_code(self, error: Exception) -> HTTPStatus:
+        return self._resolve_status(type(error))
+
+
+class ValidationError(ValueError):
+    pass
+
+
+class MissingFieldError(ValidationError):
+    pass
+
+
+class MissingNestedFieldError(MissingFieldError):
+    pass
+
+
+def build_handler(handler_class: Type[ErrorHandler]) -> ErrorHandler:
+    handler = handler_class("errors")
+    for resource in ("users", "orders", "payments"):
+        handler.error_handlers[resource][KeyError] = lambda error: Response(status=HTTPStatus.BAD_REQUEST)
+    return handler
+
+
+def main() -> None:
+    handlers = [build_handler(UncachedErrorHandler), build_handler(ErrorHandler)]
+    errors = [
+        ("NotFoundError", NotFoundError(VialError.ROUTE_NOT_FOUND.get("/missing"))),
+        ("ValueError subclass, 3 levels deep", MissingNestedFieldError("missing")),
+        ("unhandled RuntimeError", RuntimeError("failed")),
+    ]
+    rows = []
+    for name, error in errors:
+        rows.append(
+            [name, *(harness.measure(partial(handler, "orders", error), number=10_000) for handler in handlers)]
+        )
+    harness.report("Error handler dispatch (us)", ["error", "uncached", "cached"], rows)
+
+
+if __name__ == "__main__":
+    main()
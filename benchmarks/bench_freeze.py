@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import time
+from functools import partial
+from statistics import median
+from typing import Any
+
+from benchmarks import harness
+from vial.app import ProxyRouteResolver, Vial
+from vial.gateway import Gateway
+from vial.middleware import CallChain
+from vial.types import Request, Response
+
+ROUTE_COUNT = 200
+
+MIDDLEWARE_COUNT = 5
+
+APP_COUNT = 100
+
+
+class ProxyVial(Vial):
+    route_resolver_class = ProxyRouteResolver
+
+
+def passthrough(event: Request, chain: CallChain) -> Response:
+    return chain(event)
+
+
+def build_app(frozen: bool) -> Vial:
+    app = ProxyVial("freeze")
+    app.logger.disabled = True
+    for _ in range(MIDDLEWARE_COUNT):
+        app.register_middleware(passthrough)
+    for index in range(ROUTE_COUNT):
+        app.get(f"/resources-{index}/{{resource_id}}")(lambda resource_id: {"id": resource_id})
+    if frozen:
+        app.freeze()
+    return app
+
+
+def build_event(path: str) -> dict[str, Any]:
+    return {
+        "httpMethod": "GET",
+        "resource": "/{proxy+}",
+        "path": path,
+        "multiValueHeaders": {},
+        "multiValueQueryStringParameters": {},
+        "body": None,
+    }
+
+
+def first_request(frozen: bool) -> float:
+    """Median latency of the first request served by freshly built applications, in microseconds."""
+    durations = []
+    for _ in range(APP_COUNT):
+        app = build_app(frozen)
+        event = build_event(f"/resources-{ROUTE_COUNT - 1}/abc")
+        start = time.perf_counter()
+        app(event, Gateway.get_context())
+        durations.append((time.perf_counter() - start) * 1_000_000)
+    return median(durations)
+
+
+def main() -> None:
+    rows = []
+    for name, frozen in [("not frozen, chains compiled on first use", False), ("frozen during init", True)]:
+        app = build_app(frozen)
+        event = build_event(f"/resources-{ROUTE_COUNT - 1}/abc")
+        app(event, Gateway.get_context())
+        rows.append([name, first_request(frozen), harness.measure(partial(app, event, Gateway.get_context()))])
+    harness.report(
+        f"Request latency with {ROUTE_COUNT} routes and {MIDDLEWARE_COUNT} middleware (us)",
+        ["application", "first request", "steady state"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from statistics import median
+
+from benchmarks import harness
+
+# Standard library modules vial.app is built on, imported ahead of it so that its import time can be measured relative
+# to them, which cancels out most of the difference in speed between machines
+REFERENCE_MODULES = "inspect, dataclasses, logging, json, http, base64, datetime, urllib.parse"
+
+# CPU time rather than wall time, so that time spent waiting on other processes of a busy machine isn't counted
+MEASUREMENT = f"""
+import time
+started = time.process_time()
+import {REFERENCE_MODULES}
+reference = time.process_time() - started
+started = time.process_time()
+import vial.app
+print(reference, time.process_time() - started)
+"""
+
+# Import time of vial.app relative to the reference modules, measured before any of the optional features were added
+BASELINE_RATIO = 1.4
+
+# Leaves room for what features can't import lazily and for noise, a single eager import of a large module exceeds it
+IMPORT_BUDGET = BASELINE_RATIO * 1.25
+
+RUNS = 15
+
+
+def relative_import_time() -> float:
+    output = subprocess.run([sys.executable, "-c", MEASUREMENT], capture_output=True, check=True, text=True).stdout
+    reference, app = map(float, output.split())
+    return app / reference
+
+
+def main() -> int:
+    """Fails when the median import time of vial.app relative to the reference modules exceeds the budget."""
+    ratio = median(relative_import_time() for _ in range(RUNS))
+    harness.report(
+        "Import time of vial.app relative to the standard library",
+        ["baseline", "budget", "current"],
+        [[BASELINE_RATIO, IMPORT_BUDGET, ratio]],
+    )
+    if ratio > IMPORT_BUDGET:
+        sys.stderr.write(f"Import time ratio {ratio:.2f} exceeds the budget of {IMPORT_BUDGET:.2f}\n")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
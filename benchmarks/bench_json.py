@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import dataclasses
+from dataclasses import dataclass
+from enum import Enum
+from functools import partial
+from typing import Any
+from uuid import UUID, uuid4
+
+from benchmarks import harness
+from vial.json import NativeJson, SimpleJson, UjsonJson
+from vial.orjson_json import OrjsonJson
+
+
+class Status(Enum):
+    ACTIVE = "active"
+    ARCHIVED = "archived"
+
+
+@dataclass
+class Item:
+    item_id: UUID
+    name: str
+    price: float
+    status: Status
+    tags: set[str]
+
+
+def build_payloads(count: int) -> dict[str, Any]:
+    items = [Item(uuid4(), f"Item {i}", i * 1.25, Status.ACTIVE, {"new", "sale"}) for i in range(count)]
+    return {
+        "native types": [{**dataclasses.asdict(item), "item_id": str(item.item_id), "tags": ["new"]} for item in items],
+        "uuid / enum / set": [{"id": item.item_id, "status": item.status, "tags": item.tags} for item in items],
+        "dataclasses": items,
+    }
+
+
+def main() -> None:
+    backends = [NativeJson, SimpleJson, UjsonJson, OrjsonJson]
+    rows = []
+    for name, payload in build_payloads(1000).items():
+        rows.append([name, *(harness.measure(partial(backend.dumps, payload), number=20) for backend in backends)])
+    headers = ["payload (1000 items)", *(backend.__name__ for backend in backends)]
+    harness.report("JSON serialization (us per dumps)", headers, rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import logging
+from functools import partial
+from logging import Formatter, LogRecord
+
+from benchmarks import harness
+from vial.gateway import Gateway
+from vial.json import NativeJson
+from vial.loggers import FastJsonFormatter, JsonFormatter
+from vial.request import RequestContext
+from vial.types import HTTPMethod, MultiDict, Request
+
+
+class NativeJsonFormatter(JsonFormatter):
+    json_class = NativeJson
+
+
+def build_record(**extra: object) -> LogRecord:
+    record = LogRecord("orders", logging.INFO, "/src/orders.py", 42, "Created order %s", ("123",), None, "create")
+    record.__dict__.update(extra)
+    return record
+
+
+def build_formatters() -> list[tuple[str, Formatter]]:
+    return [
+        ("JsonFormatter with json", NativeJsonFormatter()),
+        ("JsonFormatter", JsonFormatter()),
+        ("FastJsonFormatter", FastJsonFormatter()),
+        (
+            "FastJsonFormatter with static fields",
+            FastJsonFormatter(static_fields={"service": "orders", "stage": "prod"}),
+        ),
+    ]
+
+
+def main() -> None:
+    request = Request({}, Gateway.get_context(), HTTPMethod.GET, "/orders", "/orders", MultiDict(), MultiDict(), None)
+    rows = []
+    with RequestContext(request):
+        for name, formatter in build_formatters():
+            plain = harness.measure(partial(formatter.format, build_record()), number=10_000)
+            extra = harness.measure(partial(formatter.format, build_record(order_id="123", total=10)), number=10_000)
+            rows.append([name, plain, extra])
+    harness.report("Formatting a log record within a request (us)", ["formatter", "plain", "with extra"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import base64
+from functools import partial
+from http import HTTPStatus
+from typing import Any
+
+from benchmarks import harness
+from vial.app import Vial
+from vial.gateway import Gateway
+from vial.middleware import CallChain
+from vial.types import HTTPMethod, LambdaContext, MultiDict, Request, Response
+
+
+class EagerVial(Vial):
+    """Builds every request field up front, the way requests were built before they became lazy."""
+
+    def _build_request(self, event: dict[str, Any], context: LambdaContext) -> Request:
+        body = event["body"]
+        return Request(
+            event,
+            context,
+            HTTPMethod[event["httpMethod"]],
+            event["resource"],
+            event["path"],
+            MultiDict(event["multiValueHeaders"]),
+            MultiDict(event["multiValueQueryStringParameters"]),
+            base64.b64decode(body).decode("utf-8") if event.get("isBase64Encoded") and body else body,
+        )
+
+
+def reject_unauthorized(event: Request, chain: CallChain) -> Response:
+    if event.resource == "/private":
+        return Response({"message": "Unauthorized"}, status=HTTPStatus.UNAUTHORIZED)
+    return chain(event)
+
+
+def build_app(app: Vial) -> Vial:
+    app.logger.disabled = True
+    app.register_middleware(reject_unauthorized)
+    app.post("/private")(lambda: {"status": "OK"})
+    return app
+
+
+def build_event(resource: str) -> dict[str, Any]:
+    body = base64.b64encode(b'{"payload": "' + b"x" * 64 * 1024 + b'"}').decode("utf-8")
+    headers = {f"x-header-{i}": [f"value-{i}"] for i in range(30)}
+    return {
+        "httpMethod": "POST",
+        "resource": resource,
+        "path": resource,
+        "multiValueHeaders": headers,
+        "multiValueQueryStringParameters": {"page": ["1"], "size": ["50"]},
+        "body": body,
+        "isBase64Encoded": True,
+    }
+
+
+def main() -> None:
+    apps = [build_app(EagerVial("eager")), build_app(Vial("lazy"))]
+    context = Gateway.get_context()
+    rows = []
+    for name, resource in [("not found (404)", "/missing"), ("rejected by middleware (401)", "/private")]:
+        event = build_event(resource)
+        rows.append([name, *(harness.measure(partial(app, event, context), number=200) for app in apps)])
+    harness.report("Rejected requests with a 64KB base64 body (us)", ["path", "eager request", "LazyRequest"], rows)
+
+
+if __name__ == "__main__":
+    main()
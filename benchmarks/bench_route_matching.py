@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from functools import partial
+
+from benchmarks import harness
+from vial.matchers import RouteMatcher, TrieRouteMatcher
+
+ROUTE_COUNTS = (10, 50, 100, 300, 1000)
+
+
+def build_routes(count: int) -> list[str]:
+    routes: list[str] = []
+    for i in range(count // 2):
+        routes.append(f"/service-{i}/items")
+        routes.append(f"/service-{i}/items/{{item_id}}/details")
+    return routes
+
+
+def main() -> None:
+    rows = []
+    for count in ROUTE_COUNTS:
+        routes = build_routes(count)
+        url = routes[-1].replace("{item_id}", "12345")
+        linear, trie = RouteMatcher(routes), TrieRouteMatcher(routes)
+        rows.append([count, harness.measure(partial(linear.match, url)), harness.measure(partial(trie.match, url))])
+    harness.report("Route matching (us per match)", ["routes", "RouteMatcher", "TrieRouteMatcher"], rows)
+
+
+if __name__ == "__main__":
+    main()
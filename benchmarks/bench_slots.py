@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import dataclasses
+import tracemalloc
+from dataclasses import dataclass
+from functools import cached_property, partial
+from typing import Any, Callable
+
+from benchmarks import harness
+from vial.gateway import Gateway
+from vial.routes import Route
+from vial.types import HTTPMethod, LambdaContext, LazyRequest, MultiDict, Request, Response
+
+BATCH_SIZE = 100
+
+LAZY_FIELDS = ("method", "resource", "path", "headers", "query_parameters", "body", "raw_body")
+
+EVENT = {
+    "httpMethod": "GET",
+    "resource": "/users/{id}",
+    "path": "/users/1",
+    "multiValueHeaders": {"accept": ["application/json"]},
+    "multiValueQueryStringParameters": {"expand": ["orders"]},
+    "body": None,
+}
+
+Factory = Callable[[], Any]
+
+
+def with_dict(class_: type) -> type:
+    """Rebuilds a slotted dataclass as a regular one, with the same fields and defaults but a per-instance __dict__."""
+    namespace: dict[str, Any] = {"__annotations__": {}}
+    for field in dataclasses.fields(class_):
+        namespace["__annotations__"][field.name] = field.type
+        defaults: dict[str, Any] = {"default": field.default, "default_factory": field.default_factory}
+        namespace[field.name] = dataclasses.field(**defaults)
+    frozen = class_.__dataclass_params__.frozen  # type: ignore[attr-defined]
+    return dataclass(frozen=frozen)(type(f"Dict{class_.__name__}", (), namespace))
+
+
+def with_cached_properties() -> type:
+    """Rebuilds LazyRequest the way it used to be, caching every decoded field in the __dict__ of its instances."""
+    namespace: dict[str, Any] = {name: cached_property(getattr(LazyRequest, f"_decode_{name}")) for name in LAZY_FIELDS}
+    namespace["__init__"] = LazyRequest.__init__
+    return type("DictLazyRequest", (with_dict(Request),), namespace)
+
+
+def build_factories(context: Any, request: type, response: type, route: type) -> dict[str, Factory]:
+    context_fields = dataclasses.astuple(Gateway.get_context())
+    headers, query = MultiDict({"accept": ["application/json"]}), MultiDict({"expand": ["orders"]})
+    return {
+        "LambdaContext": partial(context, *context_fields),
+        "Request": partial(request, {}, None, HTTPMethod.GET, "/users/{id}", "/users/1", headers, query, None),
+        "Response": partial(response, {"id": 1}, {"Content-Type": "application/json"}),
+        "Route": partial(route, "/users/{id}", "/users/{id}", HTTPMethod.GET, {}, str, {}),
+    }
+
+
+def size(factory: Factory, count: int = 10_000) -> float:
+    """Returns the memory allocated per instance in bytes, arguments shared between instances aren't counted."""
+    factory()
+    tracemalloc.start()
+    instances = [factory() for _ in range(count)]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (allocated - len(instances) * 8) / count
+
+
+def read_fields(instance: Any) -> None:
+    for _ in range(10):
+        _ = (instance.method, instance.resource, instance.path, instance.headers, instance.body)
+
+
+def invocation(factories: dict[str, Factory]) -> None:
+    """Allocates the objects of a single invocation of a replayed batch, reading the request like a route would."""
+    factories["LambdaContext"]()
+    read_fields(factories["Request"]())
+    factories["Response"]()
+
+
+def batch(factories: dict[str, Factory]) -> None:
+    for _ in range(BATCH_SIZE):
+        invocation(factories)
+
+
+def timings(regular: dict[str, Factory], slotted: dict[str, Factory]) -> list[list[Any]]:
+    return [
+        ["allocate Request (us)", harness.measure(regular["Request"]), harness.measure(slotted["Request"])],
+        [
+            "read Request fields (us)",
+            harness.measure(partial(read_fields, regular["Request"]())),
+            harness.measure(partial(read_fields, slotted["Request"]())),
+        ],
+        [
+            f"replayed batch of {BATCH_SIZE} (us)",
+            harness.measure(partial(batch, regular), number=100),
+            harness.measure(partial(batch, slotted), number=100),
+        ],
+    ]
+
+
+def route_lookup(factory: Factory) -> None:
+    """Creates a request and reads the fields needed to find its route, like every invocation does."""
+    request = factory()
+    _ = (request.method, request.resource, request.path)
+
+
+def decode(factory: Factory) -> Any:
+    request = factory()
+    for name in LAZY_FIELDS:
+        getattr(request, name)
+    return request
+
+
+def lazy_rows() -> list[list[Any]]:
+    regular, slotted = partial(with_cached_properties(), EVENT, None), partial(LazyRequest, EVENT, None)
+    return [
+        ["size of LazyRequest (bytes)", size(regular), size(slotted)],
+        ["size of decoded LazyRequest (bytes)", size(partial(decode, regular)), size(partial(decode, slotted))],
+        ["allocate LazyRequest (us)", harness.measure(regular), harness.measure(slotted)],
+        [
+            "find route of LazyRequest (us)",
+            harness.measure(partial(route_lookup, regular)),
+            harness.measure(partial(route_lookup, slotted)),
+        ],
+        [
+            "read LazyRequest fields (us)",
+            harness.measure(partial(read_fields, regular())),
+            harness.measure(partial(read_fields, slotted())),
+        ],
+    ]
+
+
+def main() -> None:
+    slotted = build_factories(LambdaContext, Request, Response, Route)
+    regular = build_factories(*map(with_dict, (LambdaContext, Request, Response, Route)))
+    sizes = [[f"size of {name} (bytes)", size(regular[name]), size(factory)] for name, factory in slotted.items()]
+    harness.report("Request path types", ["operation", "__dict__", "__slots__"], sizes + timings(regular, slotted))
+    harness.report("LazyRequest", ["operation", "cached_property", "__slots__"], lazy_rows())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import timeit
+from statistics import median
+from typing import Any, Callable, Sequence
+
+
+def measure(function: Callable[[], Any], number: int = 1000, repeat: int = 5) -> float:
+    """Returns the best observed duration of a single call in microseconds, which is the least noisy estimate."""
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1_000_000
+
+
+def import_time(module: str, runs: int = 10) -> float:
+    """
+    Returns the median time taken to import a module into a fresh interpreter in microseconds, as reported by
+    -X importtime, which leaves out the startup of the interpreter itself and the modules it already imported.
+    """
+    return median(_import_time(module) for _ in range(runs))
+
+
+def _import_time(module: str) -> int:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, check=True
+    )
+    total = 0
+    for line in result.stderr.decode("utf-8").splitlines():
+        _, cumulative, name = line.split("|")
+        # Top level imports aren't indented, modules imported by them are nested under them
+        if not name.startswith("  ") and (module == name.strip() or module.startswith(f"{name.strip()}.")):
+            total += int(cumulative)
+    return total
+
+
+def report(title: str, headers: Sequence[str], rows: Sequence[Sequence[Any]]) -> None:
+    cells = [list(map(str, headers))] + [[_format(value) for value in row] for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    lines = [title, "=" * len(title)]
+    for index, row in enumerate(cells):
+        lines.append("  ".join(value.rjust(width) for value, width in zip(row, widths)))
+        if index == 0:
+            lines.append("  ".join("-" * width for width in widths))
+    sys.stdout.write("\n".join(lines) + "\n\n")
+
+
+def _format(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import logging
+import sys
+import time
+from functools import partial
+from logging import LogRecord
+from pathlib import Path
+from statistics import median
+from typing import Any, Callable, Sequence
+
+from benchmarks import harness
+from benchmarks.bench_freeze import ProxyVial, build_event
+from vial.app import ProxyRouteResolver, Resource, Vial
+from vial.exceptions import BadRequestError, VialError
+from vial.gateway import Gateway
+from vial.loggers import JsonFormatter
+from vial.middleware import CallChain
+from vial.types import HTTPMethod, Request, Response
+
+BASELINE = Path(__file__).parent / "baseline.json"
+
+PROXY_ROUTE_COUNT = 500
+
+MIDDLEWARE_COUNT = 10
+
+ITEM_COUNT = 1000
+
+Case = Callable[[], float]
+
+
+def passthrough(event: Request, chain: CallChain) -> Response:
+    return chain(event)
+
+
+def invalid() -> None:
+    raise BadRequestError(VialError.UNKNOWN_ERROR.get("Invalid request"))
+
+
+def build_app() -> Vial:
+    app = Vial("suite")
+    app.logger.disabled = True
+    app.get("/health")(lambda: {"status": "OK"})
+    app.get("/users/{user_id:int}")(lambda user_id: {"id": user_id})
+    app.get("/invalid")(invalid)
+    app.get("/items")(lambda: [{"id": index, "name": f"item-{index}"} for index in range(ITEM_COUNT)])
+    middleware = Resource("middleware")
+    for _ in range(MIDDLEWARE_COUNT):
+        middleware.register_middleware(passthrough)
+    middleware.get("/middleware")(lambda: {"status": "OK"})
+    app.register_resource(middleware)
+    return app
+
+
+def build_proxy_app() -> Vial:
+    app = ProxyVial("proxy-suite")
+    app.logger.disabled = True
+    for index in range(PROXY_ROUTE_COUNT):
+        app.get(f"/service-{index}/items/{{item_id}}")(lambda item_id: {"id": item_id})
+    app.freeze()
+    return app
+
+
+def invoke(app: Vial, events: Any) -> None:
+    app(next(events), Gateway.get_context())
+
+
+def steady_state(app: Vial, *events: dict[str, Any]) -> float:
+    cycle = itertools.cycle(events)
+    invoke(app, cycle)
+    return harness.measure(partial(invoke, app, cycle))
+
+
+def first_request(runs: int = 100) -> float:
+    durations = []
+    for _ in range(runs):
+        app = build_app()
+        event = Gateway(app).build_request(HTTPMethod.GET, "/users/1")
+        start = time.perf_counter()
+        app(event, Gateway.get_context())
+        durations.append((time.perf_counter() - start) * 1_000_000)
+    return median(durations)
+
+
+def proxy_matching() -> float:
+    """Paths are all distinct and outnumber the resolver cache, so every request is matched against the trie."""
+    app = build_proxy_app()
+    count = ProxyRouteResolver.cache_size * 4
+    paths = [f"/service-{index % PROXY_ROUTE_COUNT}/items/{index}" for index in range(count)]
+    return steady_state(app, *map(build_event, paths))
+
+
+def log_record() -> float:
+    record = LogRecord("suite", logging.INFO, "/src/suite.py", 42, "Created order %s", ("123",), None, "create")
+    return harness.measure(partial(JsonFormatter().format, record), number=10_000)
+
+
+def build_cases() -> dict[str, Case]:
+    app = build_app()
+    gateway = Gateway(app)
+    paths = ("/health", "/users/1", "/middleware", "/invalid", "/items")
+    events = {path: gateway.build_request(HTTPMethod.GET, path) for path in paths}
+    return {
+        "cold import": partial(harness.import_time, "vial.app"),
+        "first request": first_request,
+        "simple route": partial(steady_state, app, events["/health"]),
+        "path parameters": partial(steady_state, app, events["/users/1"]),
+        f"{MIDDLEWARE_COUNT} middleware": partial(steady_state, app, events["/middleware"]),
+        "error response": partial(steady_state, app, events["/invalid"]),
+        f"{ITEM_COUNT} item body": partial(steady_state, app, events["/items"]),
+        f"proxy matching, {PROXY_ROUTE_COUNT} routes": proxy_matching,
+        "log record": log_record,
+    }
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    """Reports the results next to the baseline, returning the names of the cases that regressed past the threshold."""
+    rows, regressions = [], []
+    for name, duration in results.items():
+        if (expected := baseline.get(name)) is None:
+            rows.append([name, duration, "-", "-"])
+            continue
+        change = (duration - expected) / expected * 100
+        rows.append([name, duration, expected, f"{change:+.1f}%"])
+        if change > threshold:
+            regressions.append(name)
+    harness.report("Request pipeline compared to the baseline (us)", ["case", "current", "baseline", "change"], rows)
+    return regressions
+
+
+def parse_arguments(arguments: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    parser.add_argument("cases", nargs="*", help="cases to run, every case by default")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=15.0, help="slowdown percentage failing the comparison")
+    return parser.parse_args(arguments)
+
+
+def main(arguments: Sequence[str] | None = None) -> int:
+    options = parse_arguments(arguments)
+    cases = build_cases()
+    results = {name: case() for name, case in cases.items() if not options.cases or name in options.cases}
+    baseline = json.loads(options.baseline.read_text()) if options.baseline.exists() else {}
+    if options.save:
+        options.baseline.write_text(json.dumps({**baseline, **results}, indent=2) + "\n")
+        harness.report("Request pipeline (us)", ["case", "duration"], [[name, results[name]] for name in results])
+        return 0
+    if regressions := compare(results, baseline, options.threshold):
+        sys.stderr.write(f"Regressed by more than {options.threshold}%: {', '.join(regressions)}\n")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import asyncio
+from http import HTTPStatus
+
+from vial.app import Vial
+from vial.gateway import Gateway
+from vial.middleware import AsyncCallChain
+from vial.types import Request, Response
+
+app = Vial(__name__)
+
+
+@app.middleware
+async def add_header(event: Request, chain: AsyncCallChain) -> Response:
+    response = await chain(event)
+    response.headers["async-middleware"] = "executed"
+    return response
+
+
+@app.get("/users/{user_id}")
+async def get_user(user_id: str) -> dict[str, str]:
+    await asyncio.sleep(0)
+    return {"id": user_id}
+
+
+def test_get_user() -> None:
+    response = Gateway(app).get("/users/123")
+    assert response.status == HTTPStatus.OK
+    assert response.body == {"id": "123"}
+    assert response.headers["async-middleware"] == "executed"
@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+from http import HTTPStatus
+
+from vial.app import ProxyRouteResolver, Vial
+from vial.gateway import Gateway
+
+
+class ProxyVial(Vial):
+    route_resolver_class = ProxyRouteResolver
+
+
+app = ProxyVial(__name__)
+
+
+@dataclass
+class User:
+    user_id: str
+
+
+@app.get("/users/{user_id}")
+def get_user(user_id: str) -> User:
+    return User(user_id)
+
+
+@app.get("/users/me")
+def get_current_user() -> User:
+    return User("me")
+
+
+def test_get_user() -> None:
+    event = {
+        "httpMethod": "GET",
+        "resource": "/{proxy+}",
+        "path": "/users/kenobi",
+        "multiValueHeaders": {},
+        "multiValueQueryStringParameters": None,
+        "pathParameters": {"proxy": "users/kenobi"},
+        "body": None,
+    }
+    response = Gateway(app).build_response(app(event, Gateway.get_context()))
+    assert response.status == HTTPStatus.OK
+    assert response.body == {"user_id": "kenobi"}
+
+
+def test_get_current_user() -> None:
+    response = Gateway(app).get("/users/me")
+    assert response.status == HTTPStatus.OK
+    assert response.body == {"user_id": "me"}
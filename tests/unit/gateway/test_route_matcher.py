@@ -1,14 +1,17 @@
+from typing import cast
+
 import pytest
 
 from vial.exceptions import NotFoundError
 from vial.gateway import RouteMatcher
+from vial.matchers import TrieRouteMatcher
 
 from tests.application.application import app
 
 
-@pytest.fixture(name="matcher")
-def matcher_fixture() -> RouteMatcher:
-    return RouteMatcher(list(app.routes))
+@pytest.fixture(name="matcher", params=[RouteMatcher, TrieRouteMatcher])
+def matcher_fixture(request: pytest.FixtureRequest) -> RouteMatcher:
+    return cast(RouteMatcher, request.param(list(app.routes)))
 
 
 def test_match_exact_no_path_params(matcher: RouteMatcher) -> None:
@@ -41,3 +44,34 @@ def test_match_exact_path_params(matcher: RouteMatcher) -> None:
 
 def test_match_no_route_available(matcher: RouteMatcher) -> None:
     pytest.raises(NotFoundError, matcher.match, "/this/is/a/very/fake/path/that/obviously/wont/get/matched")
+
+
+def test_match_root() -> None:
+    match = TrieRouteMatcher(["/", "/health"]).match("/")
+    assert match.route == "/"
+    assert not match.path_params
+
+
+def test_match_prefers_static_segments() -> None:
+    matcher = TrieRouteMatcher(["/users/{user_id}", "/users/me", "/users/{user_id}/addresses"])
+    assert matcher.match("/users/me").route == "/users/me"
+    assert matcher.match("/users/12345").path_params == {"user_id": "12345"}
+
+
+def test_match_falls_back_to_variable_segments() -> None:
+    matcher = TrieRouteMatcher(["/users/me/settings", "/users/{user_id}/addresses"])
+    match = matcher.match("/users/me/addresses")
+    assert match.route == "/users/{user_id}/addresses"
+    assert match.path_params == {"user_id": "me"}
+
+
+def test_match_variable_names_per_route() -> None:
+    matcher = TrieRouteMatcher(["/stores/{store_id}", "/stores/{id}/items/{item_id}"])
+    assert matcher.match("/stores/1").path_params == {"store_id": "1"}
+    assert matcher.match("/stores/1/items/2").path_params == {"id": "1", "item_id": "2"}
+
+
+def test_match_partial_route_not_matched() -> None:
+    matcher = TrieRouteMatcher(["/stores/{store_id}/items"])
+    pytest.raises(NotFoundError, matcher.match, "/stores/1")
+    pytest.raises(NotFoundError, matcher.match, "/stores/1/items/2")
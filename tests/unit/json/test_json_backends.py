@@ -0,0 +1,97 @@
+import dataclasses
+import json
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterator, Type, cast
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from vial.json import FASTEST_JSON, DefaultEncoder, Json, NativeJson, SimpleJson, UjsonJson, register_encoder
+from vial.orjson_json import OrjsonJson
+from vial.types import HTTPMethod
+
+
+@dataclass
+class Kitchen:
+    table_count: int
+
+
+@dataclass
+class House:
+    kitchen: Kitchen
+    color: str
+
+
+@pytest.fixture(name="backend", params=[NativeJson, SimpleJson, UjsonJson, OrjsonJson])
+def backend_fixture(request: pytest.FixtureRequest) -> Type[Json]:
+    return cast(Type[Json], request.param)
+
+
+@pytest.fixture(name="registered")
+def registered_fixture() -> Iterator[None]:
+    with patch.dict(DefaultEncoder.ENCODERS.encoders), patch.dict(DefaultEncoder.ENCODERS.resolved, clear=True):
+        register_encoder(Decimal, str)
+        register_encoder(datetime, lambda value: value.strftime("%d/%m/%Y"))
+        register_encoder(Kitchen, lambda value: f"{value.table_count} tables")
+        yield
+
+
+def test_fastest_json() -> None:
+    assert FASTEST_JSON is UjsonJson
+
+
+def test_dumps_loads(backend: Type[Json]) -> None:
+    data = {"hello": "world", "path": "/a/b", "values": [1, 2.5, True, None]}
+    assert json.loads(backend.dumps(data)) == data
+    assert backend.loads(json.dumps(data)) == data
+
+
+@pytest.mark.parametrize("backend", [NativeJson, SimpleJson, UjsonJson])
+def test_dumps_loads_nan(backend: Type[Json]) -> None:
+    assert backend.dumps({"value": float("nan")}).replace(" ", "") == '{"value":NaN}'
+    assert math.isnan(backend.loads('{"value": NaN}')["value"])
+
+
+def test_dumps_set(backend: Type[Json]) -> None:
+    assert sorted(json.loads(backend.dumps({"one", "two", "three"}))) == ["one", "three", "two"]
+
+
+def test_dumps_uuid(backend: Type[Json]) -> None:
+    value = uuid4()
+    assert json.loads(backend.dumps({"value": value})) == {"value": str(value)}
+
+
+def test_dumps_dataclass(backend: Type[Json]) -> None:
+    value = House(Kitchen(2), "Blue")
+    assert json.loads(backend.dumps([value])) == [dataclasses.asdict(value)]
+
+
+@pytest.mark.parametrize("backend", [NativeJson, SimpleJson, UjsonJson])
+def test_dumps_enum(backend: Type[Json]) -> None:
+    assert json.loads(backend.dumps({"value": HTTPMethod.GET})) == {"value": HTTPMethod.GET.name}
+
+
+def test_dumps_enum_orjson() -> None:
+    assert json.loads(OrjsonJson.dumps({"value": HTTPMethod.GET})) == {"value": HTTPMethod.GET.value}
+
+
+def test_dumps_failure(backend: Type[Json]) -> None:
+    pytest.raises(TypeError, backend.dumps, [object()])
+
+
+@pytest.mark.usefixtures("registered")
+@pytest.mark.parametrize("backend", [NativeJson, SimpleJson, OrjsonJson])
+def test_dumps_registered_types(backend: Type[Json]) -> None:
+    value = {"price": Decimal("1.50"), "date": datetime(2024, 5, 1), "kitchen": Kitchen(2)}
+    assert json.loads(backend.dumps(value)) == json.loads(NativeJson.dumps(value))
+    assert json.loads(backend.dumps(value)) == {"price": "1.50", "date": "01/05/2024", "kitchen": "2 tables"}
+
+
+@pytest.mark.usefixtures("registered")
+def test_dumps_registered_types_ujson() -> None:
+    value = {"price": Decimal("1.50"), "date": datetime(2024, 5, 1), "kitchen": Kitchen(2)}
+    assert json.loads(UjsonJson.dumps(value)) == {"price": 1.5, "date": "01/05/2024", "kitchen": "2 tables"}
@@ -2,11 +2,13 @@ import dataclasses
 import json
 from dataclasses import dataclass
 from decimal import Decimal
+from enum import Enum
+from unittest.mock import patch
 from uuid import uuid4
 
 import pytest
 
-from vial.json import NativeJson
+from vial.json import DefaultEncoder, EncoderRegistry, NativeJson, register_encoder, to_dict
 from vial.types import HTTPMethod
 
 
@@ -56,3 +58,52 @@ def test_dumps_dataclass() -> None:
 
 def test_dumps_failure() -> None:
     pytest.raises(TypeError, NativeJson.dumps, [Decimal("42.24")])
+
+
+def test_dumps_registered_type() -> None:
+    with patch.dict(DefaultEncoder.ENCODERS.encoders), patch.dict(DefaultEncoder.ENCODERS.resolved, clear=True):
+        register_encoder(Decimal, str)
+        assert NativeJson.dumps([Decimal("42.24")]) == json.dumps(["42.24"])
+
+
+def test_encoder_registry_resolves_subclasses() -> None:
+    registry = EncoderRegistry({Enum: str}, [])
+    assert registry.get(HTTPMethod.GET) is str
+    assert registry.resolved == {HTTPMethod: str}
+
+
+def test_encoder_registry_caches_missing_encoders() -> None:
+    registry = EncoderRegistry({}, [(dataclasses.is_dataclass, dataclasses.asdict)])
+    assert registry.get(Decimal("1")) is None
+    assert registry.resolved == {Decimal: None}
+
+    registry.register(Decimal, str)
+    assert registry.get(Decimal("1")) is str
+
+
+def test_encoder_registry_matchers() -> None:
+    registry = EncoderRegistry({}, [])
+    assert registry.get(Kitchen(1)) is None
+
+    registry.register_matcher(dataclasses.is_dataclass, dataclasses.asdict)
+    assert registry.get(Kitchen(1)) is dataclasses.asdict
+
+
+@dataclass
+class Empty:
+    pass
+
+
+def test_to_dict() -> None:
+    house = House(Kitchen(2), "Blue")
+    assert to_dict(house) == {"kitchen": house.kitchen, "color": "Blue"}
+    assert to_dict(house)["kitchen"] is house.kitchen
+
+
+def test_to_dict_single_and_no_fields() -> None:
+    assert to_dict(Kitchen(2)) == {"table_count": 2}
+    assert not to_dict(Empty())
+
+
+def test_dumps_dataclass_type_failure() -> None:
+    pytest.raises(TypeError, NativeJson.dumps, [Kitchen])
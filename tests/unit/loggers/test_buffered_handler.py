@@ -0,0 +1,84 @@
+import io
+import logging
+from logging import Formatter, Logger, LogRecord
+from unittest.mock import MagicMock
+
+import pytest
+
+from vial.app import Vial
+from vial.gateway import Gateway
+from vial.loggers import BufferedStreamHandler, JsonLoggerFactory, flush_buffers
+
+
+class BufferedLoggerFactory(JsonLoggerFactory):
+    handler_class = BufferedStreamHandler
+
+
+@pytest.fixture(name="stream")
+def stream_fixture() -> io.StringIO:
+    return io.StringIO()
+
+
+@pytest.fixture(name="handler")
+def handler_fixture(stream: io.StringIO) -> BufferedStreamHandler:
+    handler = BufferedStreamHandler(stream, capacity=3)
+    handler.setFormatter(Formatter("%(levelname)s %(message)s"))
+    return handler
+
+
+@pytest.fixture(name="logger")
+def logger_fixture(request: pytest.FixtureRequest, handler: BufferedStreamHandler) -> Logger:
+    log = logging.getLogger(f"buffered.{request.function.__name__}")
+    log.addHandler(handler)
+    log.setLevel(logging.DEBUG)
+    log.propagate = False
+    return log
+
+
+def test_buffered_until_flushed(logger: Logger, handler: BufferedStreamHandler, stream: io.StringIO) -> None:
+    logger.info("first")
+    logger.info("second")
+    assert not stream.getvalue()
+    handler.flush()
+    assert stream.getvalue() == "INFO first\nINFO second\n"
+    handler.flush()
+    assert stream.getvalue() == "INFO first\nINFO second\n"
+
+
+def test_flushed_at_capacity(logger: Logger, stream: io.StringIO) -> None:
+    for index in range(4):
+        logger.info("record %d", index)
+    assert stream.getvalue() == "INFO record 0\nINFO record 1\nINFO record 2\n"
+
+
+def test_flushed_on_error(logger: Logger, stream: io.StringIO) -> None:
+    logger.info("first")
+    logger.error("failed")
+    assert stream.getvalue() == "INFO first\nERROR failed\n"
+
+
+def test_flush_buffers(logger: Logger, stream: io.StringIO) -> None:
+    logger.info("first")
+    flush_buffers()
+    assert stream.getvalue() == "INFO first\n"
+
+
+def test_format_error(handler: BufferedStreamHandler) -> None:
+    handler.handleError = MagicMock()  # type: ignore[method-assign]
+    record = LogRecord("name", logging.INFO, "file", 1, "%s %s", ("one",), None)
+    handler.emit(record)
+    handler.handleError.assert_called_once_with(record)
+    assert not handler.buffer
+
+
+def test_flushed_after_invocation(stream: io.StringIO) -> None:
+    class BufferedVial(Vial):
+        logger_factory_class = BufferedLoggerFactory
+
+    app = BufferedVial("buffered-app")
+    handler = app.logger.handlers[-1]
+    assert isinstance(handler, BufferedStreamHandler)
+    handler.setStream(stream)
+    app.get("/health")(lambda: app.logger.info("Checking health"))
+    Gateway(app).get("/health")
+    assert '"message": "Checking health"' in stream.getvalue()
@@ -0,0 +1,93 @@
+import dataclasses
+import json
+import logging
+import sys
+from logging import LogRecord
+
+from vial.loggers import FastJsonFormatter, FastJsonLoggerFactory, JsonFormatter
+from vial.request import RequestContext
+from vial.types import HTTPMethod, LambdaContext, MultiDict, Request
+
+
+def _record(message: str = "Hello world", **extra: object) -> LogRecord:
+    record = LogRecord("fast", logging.INFO, "/src/fast.py", 10, message, (), None, "handle")
+    record.__dict__.update(extra)
+    return record
+
+
+def _request(context: LambdaContext, resource: str) -> Request:
+    return Request({}, context, HTTPMethod.GET, resource, resource, MultiDict(), MultiDict(), None)
+
+
+def test_same_as_json_formatter() -> None:
+    record = _record()
+    for created in (1656391930.0, 1656391930.1234565, 1656391930.9999996):
+        record.created = created
+        assert json.loads(FastJsonFormatter().format(record)) == json.loads(JsonFormatter().format(record))
+
+
+def test_timestamp_cached() -> None:
+    formatter = FastJsonFormatter()
+    record = _record()
+    record.created = 1656391930.25
+    assert formatter.formatTime(record) == "2022-06-28T04:52:10.250000Z"
+    record.created = 1656391930.5
+    assert formatter.formatTime(record) == "2022-06-28T04:52:10.500000Z"
+    assert formatter.second == (1656391930, "2022-06-28T04:52:10.")
+    assert formatter.formatTime(record, "%Y") == "2022"
+
+
+def test_extra_fields() -> None:
+    formatter = FastJsonFormatter()
+    log = json.loads(formatter.format(_record(order_id="123", count=2)))
+    assert log["order_id"] == "123"
+    assert log["count"] == 2
+    assert "args" not in log
+
+
+def test_static_fields() -> None:
+    log = json.loads(FastJsonFormatter(static_fields={"service": "orders"}).format(_record()))
+    assert log["service"] == "orders"
+    assert log["message"] == "Hello world"
+
+
+def test_colliding_fields_written_once(context: LambdaContext) -> None:
+    formatter = FastJsonFormatter(static_fields={"service": "orders", "level": "static", "route": "static"})
+    record = _record(service="extra", route="extra", level="extra", order_id="123")
+    with RequestContext(_request(context, "/orders")):
+        encoded = formatter.format(record)
+    pairs = json.loads(encoded, object_pairs_hook=list)
+    assert len(pairs) == len(dict(pairs))
+    log = dict(pairs)
+    assert (log["level"], log["service"], log["route"], log["order_id"]) == ("INFO", "orders", "/orders", "123")
+
+
+def test_request_fields(context: LambdaContext) -> None:
+    formatter = FastJsonFormatter()
+    assert "request_id" not in json.loads(formatter.format(_record()))
+    request = _request(context, "/orders")
+    with RequestContext(request):
+        log = json.loads(formatter.format(_record()))
+        assert (log["request_id"], log["route"]) == (context.aws_request_id, "/orders")
+        request.resource = "/orders/{order_id}"
+        assert json.loads(formatter.format(_record()))["route"] == "/orders/{order_id}"
+    with RequestContext(_request(context, "/users")):
+        assert json.loads(formatter.format(_record()))["route"] == "/users"
+    other_context = dataclasses.replace(context, aws_request_id="other")
+    with RequestContext(_request(other_context, "/users")):
+        assert json.loads(formatter.format(_record()))["request_id"] == "other"
+    assert all(isinstance(field, str) for field in formatter.request_fields)
+
+
+def test_traceback() -> None:
+    record = _record("Failed")
+    try:
+        raise ValueError("Oh no")
+    except ValueError:
+        record.exc_info = sys.exc_info()
+    assert json.loads(FastJsonFormatter().format(record))["traceback"].startswith("Traceback")
+
+
+def test_get_handler() -> None:
+    handler = FastJsonLoggerFactory.get_handler()
+    assert isinstance(handler.formatter, FastJsonFormatter)
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from logging import Logger
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from vial.app import Vial
+from vial.gateway import Gateway
+from vial.loggers import LoggerFactory, LogSampler
+from vial.request import RequestContext
+from vial.streaming import BufferedResponseWriter
+from vial.types import HTTPMethod, LambdaContext, MultiDict, Request
+
+
+@pytest.fixture(name="logger")
+def logger_fixture(request: pytest.FixtureRequest) -> Logger:
+    log = logging.getLogger(f"sampled.{request.function.__name__}")
+    log.setLevel(logging.WARNING)
+    return log
+
+
+def build_request(request_id: str, headers: dict[str, list[str]] | None = None) -> Request:
+    context = LambdaContext("sampled", "1", "arn:sampled", 128, request_id, "sampled-log", "sampled-log")
+    return Request({}, context, HTTPMethod.GET, "/", "/", MultiDict(headers or {}), MultiDict(), None)
+
+
+class Records(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.messages: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+
+
+def log_levels(logger: Logger) -> None:
+    logger.debug("debug")
+    logger.info("info")
+    logger.warning("warning")
+
+
+def test_never_sampled(logger: Logger) -> None:
+    records = Records()
+    logger.addHandler(records)
+    LogSampler([logger])
+    with RequestContext(build_request("1")):
+        log_levels(logger)
+    assert records.messages == ["warning"]
+
+
+def test_sampled(logger: Logger) -> None:
+    records = Records()
+    logger.addHandler(records)
+    LogSampler([logger])
+    with RequestContext(build_request("1")) as current:
+        current.sampled = True
+        log_levels(logger)
+    log_levels(logger)
+    assert records.messages == ["debug", "info", "warning", "warning"]
+
+
+def test_child_logger_filtered(logger: Logger) -> None:
+    records = Records()
+    logger.addHandler(records)
+    LogSampler([logger])
+    log_levels(logging.getLogger(f"{logger.name}.child"))
+    assert records.messages == ["warning"]
+
+
+def test_always_sampled(logger: Logger) -> None:
+    sampler = LogSampler([logger], rate=1.0)
+    assert all(sampler.is_sampled(build_request(str(index))) for index in range(100))
+    assert logger.level == logging.DEBUG
+
+
+def test_sample_rate(logger: Logger) -> None:
+    sampler = LogSampler([logger], rate=0.25)
+    sampled = sum(sampler.is_sampled(build_request(f"request-{index}")) for index in range(4000))
+    assert 800 < sampled < 1200
+    assert sampler.is_sampled(build_request("request-1")) == sampler.is_sampled(build_request("request-1"))
+
+
+def test_sampled_by_id(logger: Logger) -> None:
+    sampler = LogSampler([logger], rate=0.25)
+    request = build_request("request")
+    sampled = sum(sampler.is_sampled(request, f"record-{index}") for index in range(4000))
+    assert 800 < sampled < 1200
+
+
+def test_header_sampled(logger: Logger) -> None:
+    sampler = LogSampler([logger], header="X-Debug-Log")
+    assert sampler.is_sampled(build_request("1", {"X-Debug-Log": ["1"]}))
+    assert not sampler.is_sampled(build_request("2"))
+
+
+def test_header_disabled(logger: Logger) -> None:
+    sampler = LogSampler([logger])
+    assert not sampler.is_sampled(build_request("1", {"x-debug-log": ["1"]}))
+
+
+def test_factory_level_from_environment() -> None:
+    with patch.dict(os.environ, {"LOG_LEVEL": "ERROR"}):
+        assert LoggerFactory.get("sampled.environment").level == logging.ERROR
+
+
+@pytest.fixture(name="app")
+def app_fixture() -> tuple[Vial, Records]:
+    app = Vial("sampled-app")
+    app.logger.setLevel(logging.INFO)
+    records = Records()
+    app.logger.addHandler(records)
+    app.sample_logs(0.0, "x-debug-log")
+    app.get("/level")(lambda: app.logger.debug("sampled %s", RequestContext.active().request.context.aws_request_id))
+    return app, records
+
+
+def test_sampled_invocation(app: tuple[Vial, Records]) -> None:
+    gateway = Gateway(app[0])
+    gateway.get("/level", headers={"x-debug-log": "true"})
+    gateway.get("/level")
+    assert len(app[1].messages) == 1
+
+
+def test_sampled_instrumented_invocation(app: tuple[Vial, Records]) -> None:
+    app[0].instrument()
+    Gateway(app[0]).get("/level", headers={"x-debug-log": "true"})
+    assert len(app[1].messages) == 1
+
+
+def test_sampled_stream(app: tuple[Vial, Records]) -> None:
+    gateway = Gateway(app[0])
+    event = gateway.build_request(HTTPMethod.GET, "/level", headers={"x-debug-log": "true"})
+    app[0].stream(event, gateway.get_context(), BufferedResponseWriter())
+    assert len(app[1].messages) == 1
+
+
+def test_parallel_invocations_sampled_separately(app: tuple[Vial, Records]) -> None:
+    """Both invocations are in flight at the same time, the sampled one can't lower the level of the other."""
+    barrier = threading.Barrier(2, timeout=5)
+
+    @app[0].post("/orders")
+    def orders() -> None:
+        barrier.wait()
+        app[0].logger.debug("sampled %s", RequestContext.active().request.body)
+
+    records: list[dict[str, Any]] = [
+        {"messageId": str(index), "body": str(index), "eventSourceARN": "arn:aws:sqs:us-east-1:1:orders"}
+        for index in range(2)
+    ]
+    records[0]["messageAttributes"] = {"x-debug-log": {"stringValue": "1"}}
+    assert app[0].batch({"Records": records}, Gateway.get_context(), max_workers=2) == {"batchItemFailures": []}
+    assert app[1].messages == ["sampled 0"]
+
+
+def test_batch_records_sampled_separately(app: tuple[Vial, Records]) -> None:
+    app[0].sample_logs(0.5)
+    app[0].post("/orders")(lambda: app[0].logger.debug("sampled %s", RequestContext.active().request.body))
+    records = [
+        {"messageId": str(index), "body": str(index), "eventSourceARN": "arn:aws:sqs:us-east-1:1:orders"}
+        for index in range(100)
+    ]
+    app[0].batch({"Records": records}, Gateway.get_context())
+    assert 25 < len(app[1].messages) < 75
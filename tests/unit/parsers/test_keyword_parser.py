@@ -35,3 +35,8 @@ def test_register() -> None:
 def test_register_already_exists() -> None:
     cause = pytest.raises(ServerError, KeywordParser().register, "str", str)
     assert cause.value.error.code == VialError.PARSER_ALREADY_EXISTS.name
+
+
+def test_register_lazy_already_exists() -> None:
+    cause = pytest.raises(ServerError, KeywordParser().register, "uuid", str)
+    assert cause.value.error.code == VialError.PARSER_ALREADY_EXISTS.name
@@ -1,13 +1,15 @@
 import base64
 from http import HTTPStatus
-from typing import Any
+from typing import Any, Callable
 from unittest.mock import patch
 
 import pytest
 
-from vial.exceptions import VialError
+from vial.app import Resource, Vial
+from vial.exceptions import ServerError, VialError
 from vial.gateway import Gateway
-from vial.types import HTTPMethod
+from vial.middleware import CallChain, is_async
+from vial.types import HTTPMethod, Request, Response
 
 from tests.application.application import app, app_without_middleware
 
@@ -114,14 +116,17 @@ def _build_gateway_event(method: HTTPMethod, path: str) -> dict[str, Any]:
     }
 
 
-@patch.dict(app.default_error_handler.error_handlers, {Exception: None})
+@patch.object(app.default_error_handler, "error_handlers", {})
+@patch.object(app.default_error_handler, "resolved", {})
 def test_missing_default_handler(gateway: Gateway) -> None:
     response = gateway.get("/really-bad-error")
     assert response.status == HTTPStatus.INTERNAL_SERVER_ERROR
     assert response.body == {"code": VialError.UNKNOWN_ERROR.name, "message": "This can't happen"}
 
 
-@patch.dict(app.default_error_handler.error_handlers, {app.name: {Exception: None}})
+@patch.object(app.default_error_handler, "error_handlers", {app.name: {Exception: None}})
+@patch.object(app.default_error_handler, "resolved", {})
+@patch.object(app.default_error_handler, "statuses", {})
 @patch.dict(app.default_error_handler.DEFAULT_STATUSES, {Exception: None})
 def test_missing_default_handler_and_default_status(gateway: Gateway) -> None:
     response = gateway.get("/really-bad-error")
@@ -160,3 +165,107 @@ def test_body_base64_encoded(gateway: Gateway) -> None:
     response = gateway.build_response(native_response)
     assert response.status == HTTPStatus.OK
     assert response.body == {"payload": {"hello": "world"}}
+
+
+def test_nan_returned() -> None:
+    nan_app = Vial("nan-app")
+    nan_app.get("/nan")(lambda: {"value": float("nan")})
+    response = nan_app(Gateway(nan_app).build_request(HTTPMethod.GET, "/nan"), Gateway.get_context())
+    assert (response["statusCode"], response["body"]) == (HTTPStatus.OK, '{"value": NaN}')
+
+
+def test_invocation_chain_cached() -> None:
+    cached_app = Vial("cached_chain")
+    cached_app.get("/health")(lambda: {"status": "OK"})
+    gateway = Gateway(cached_app)
+
+    assert gateway.get("/health").status == HTTPStatus.OK
+    chain = cached_app.invocation_chains[(cached_app.name, "/health", HTTPMethod.GET)]
+
+    assert gateway.get("/health").status == HTTPStatus.OK
+    assert cached_app.invocation_chains[(cached_app.name, "/health", HTTPMethod.GET)] is chain
+
+
+def test_invocation_chain_invalidated() -> None:
+    cached_app = Vial("invalidated_chain")
+    key = (cached_app.name, "/health", HTTPMethod.GET)
+    cached_app.invocation_chains[key] = _empty_response
+    cached_app.get("/health")(lambda: {"status": "OK"})
+    assert not cached_app.invocation_chains
+
+    cached_app.invocation_chains[key] = _empty_response
+    cached_app.register_middleware(_add_header)
+    assert not cached_app.invocation_chains
+
+    cached_app.invocation_chains[key] = _empty_response
+    cached_app.register_resource(Resource("invalidated_resource"))
+    assert not cached_app.invocation_chains
+
+
+def test_freeze() -> None:
+    frozen_app = Vial("frozen")
+    frozen_app.get("/health")(lambda: {"status": "OK"})
+    frozen_app.freeze()
+    frozen_app.freeze()
+
+    assert frozen_app.frozen
+    assert (frozen_app.name, "/health", HTTPMethod.GET) in frozen_app.invocation_chains
+    with pytest.raises(TypeError):
+        frozen_app.routes["/other"] = {}
+    with pytest.raises(TypeError):
+        frozen_app.default_error_handler.error_handlers[frozen_app.name][ValueError] = _empty_response
+    assert Gateway(frozen_app).get("/health").body == {"status": "OK"}
+
+
+def test_frozen_on_first_invocation() -> None:
+    frozen_app = Vial("frozen_on_invocation")
+    frozen_app.get("/health")(lambda: {"status": "OK"})
+    frozen_app.get("/version")(lambda: {"version": "1"})
+    gateway = Gateway(frozen_app)
+    assert not frozen_app.frozen
+    assert gateway.get("/health").status == HTTPStatus.OK
+    assert frozen_app.frozen
+    assert list(frozen_app.invocation_chains) == [(frozen_app.name, "/health", HTTPMethod.GET)]
+
+    frozen_app.freeze()
+    assert (frozen_app.name, "/version", HTTPMethod.GET) in frozen_app.invocation_chains
+    assert gateway.get("/version").body == {"version": "1"}
+
+
+def test_middleware_inspected_once() -> None:
+    linked_app = Vial("linked")
+    linked_app.register_middleware(_add_header)
+    linked_app.get("/health")(lambda: {"status": "OK"})
+    linked_app.get("/version")(lambda: {"version": "1"})
+    with patch("vial.app.is_async", wraps=is_async) as inspected:
+        linked_app.freeze()
+    assert [call.args for call in inspected.call_args_list].count((_add_header,)) == 1
+    assert list(linked_app.middleware_links.values()) == [(_add_header, _add_header, False)]
+
+
+@pytest.mark.parametrize(
+    "register",
+    [
+        lambda app: app.get("/other")(lambda: None),
+        lambda app: app.register_middleware(_add_header),
+        lambda app: app.register_parser("custom", str),
+        lambda app: app.register_error_handler(ValueError, Response),
+        lambda app: app.register_resource(Resource("frozen_resource")),
+    ],
+)
+def test_register_after_freeze(register: Callable[[Vial], Any]) -> None:
+    frozen_app = Vial("frozen_registration")
+    frozen_app.freeze()
+    with pytest.raises(ServerError) as error:
+        register(frozen_app)
+    assert error.value.error.code == VialError.APPLICATION_FROZEN.name
+
+
+def _empty_response(event: Any) -> Response:  # pylint: disable=unused-argument
+    return Response()
+
+
+def _add_header(event: Request, chain: CallChain) -> Response:
+    response = chain(event)
+    response.headers["added"] = "true"
+    return response
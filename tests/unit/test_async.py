@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from asyncio import AbstractEventLoop
+from http import HTTPStatus
+from typing import Any, Callable
+
+from vial.app import Resource, Vial
+from vial.gateway import Gateway
+from vial.loops import EventLoopRunner
+from vial.middleware import AsyncCallChain, CallChain, is_async
+from vial.types import Request, Response
+
+
+def _tracking_app(calls: list[str]) -> Vial:
+    resource = Resource("async-resource")
+
+    @resource.get("/sync")
+    def sync_route() -> dict[str, bool]:
+        calls.append("sync-route")
+        return {"async": False}
+
+    @resource.get("/async")
+    async def async_route() -> dict[str, bool]:
+        calls.append("async-route")
+        return {"async": True}
+
+    app = Vial("async-app")
+    app.register_resource(resource)
+    return app
+
+
+def _sync_middleware(name: str, calls: list[str]) -> Callable[[Request, CallChain], Response]:
+    def middleware(event: Request, chain: CallChain) -> Response:
+        calls.append(name)
+        response = chain(event)
+        response.headers[name] = "sync"
+        return response
+
+    return middleware
+
+
+def _async_middleware(name: str, calls: list[str]) -> Callable[[Request, AsyncCallChain], Any]:
+    async def middleware(event: Request, chain: AsyncCallChain) -> Response:
+        calls.append(name)
+        response = await chain(event)
+        response.headers[name] = "async"
+        return response
+
+    return middleware
+
+
+def test_async_route() -> None:
+    calls: list[str] = []
+    response = Gateway(_tracking_app(calls)).get("/async")
+    assert response.status == HTTPStatus.OK
+    assert response.body == {"async": True}
+    assert calls == ["async-route"]
+
+
+def test_async_middleware_sync_route() -> None:
+    calls: list[str] = []
+    app = _tracking_app(calls)
+    app.register_middleware(_async_middleware("first", calls))
+    response = Gateway(app).get("/sync")
+    assert response.body == {"async": False}
+    assert response.headers["first"] == "async"
+    assert calls == ["first", "sync-route"]
+
+
+def test_sync_middleware_async_route() -> None:
+    calls: list[str] = []
+    app = _tracking_app(calls)
+    app.register_middleware(_sync_middleware("first", calls))
+    response = Gateway(app).get("/async")
+    assert response.body == {"async": True}
+    assert response.headers["first"] == "sync"
+    assert calls == ["first", "async-route"]
+
+
+def test_mixed_chain() -> None:
+    calls: list[str] = []
+    app = _tracking_app(calls)
+    app.register_middleware(_async_middleware("first", calls))
+    app.register_middleware(_sync_middleware("second", calls))
+    app.register_middleware(_async_middleware("third", calls))
+    app.register_middleware(_sync_middleware("fourth", calls))
+    response = Gateway(app).get("/async")
+    assert response.body == {"async": True}
+    assert response.headers["first"] == "async"
+    assert response.headers["second"] == "sync"
+    assert response.headers["third"] == "async"
+    assert response.headers["fourth"] == "sync"
+    assert calls == ["first", "second", "third", "fourth", "async-route"]
+
+
+def test_loop_reused() -> None:
+    app = Vial("loop-app")
+    loops: list[AbstractEventLoop] = []
+
+    @app.get("/loop")
+    async def loop() -> None:
+        loops.append(asyncio.get_running_loop())
+
+    gateway = Gateway(app)
+    gateway.get("/loop")
+    gateway.get("/loop")
+    assert len(loops) == 2
+    assert loops[0] is loops[1]
+
+
+async def _wait(started: asyncio.Event) -> int:
+    await started.wait()
+    return 1
+
+
+async def _start(started: asyncio.Event) -> int:
+    started.set()
+    return 2
+
+
+def test_concurrent_awaits() -> None:
+    app = Vial("concurrent-app")
+
+    @app.get("/gather")
+    async def gather() -> dict[str, list[int]]:
+        started = asyncio.Event()
+        return {"values": list(await asyncio.gather(_wait(started), _start(started)))}
+
+    assert Gateway(app).get("/gather").body == {"values": [1, 2]}
+
+
+def test_runner_loop_per_thread() -> None:
+    runner = EventLoopRunner()
+    loops: list[AbstractEventLoop] = [runner.loop]
+    thread = threading.Thread(target=lambda: loops.append(runner.loop))
+    thread.start()
+    thread.join()
+    assert loops[0] is not loops[1]
+    assert runner.loop is loops[0]
+
+
+def test_runner_replaces_closed_loop() -> None:
+    runner = EventLoopRunner()
+    loop = runner.loop
+    loop.close()
+    assert runner.loop is not loop
+    assert runner.run(asyncio.sleep(0, "done")) == "done"
+
+
+def test_is_async() -> None:
+    class AsyncMiddleware:
+        async def __call__(self, event: Request, chain: AsyncCallChain) -> Response:
+            return await chain(event)
+
+    async def function() -> None:
+        pass
+
+    assert is_async(function)
+    assert is_async(AsyncMiddleware())
+    assert not is_async(_sync_middleware("name", []))
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import base64
+import copy
+import threading
+from typing import Any
+
+import pytest
+
+from vial import request
+from vial.app import Vial
+from vial.batch import RecordMapper
+from vial.exceptions import BadRequestError, VialError
+from vial.types import HTTPMethod, LambdaContext
+
+
+def _sqs_record(message_id: str, body: str, queue: str = "orders", **attributes: str) -> dict[str, Any]:
+    return {
+        "messageId": message_id,
+        "body": body,
+        "eventSource": "aws:sqs",
+        "eventSourceARN": f"arn:aws:sqs:us-east-1:123456789012:{queue}",
+        "messageAttributes": {name: {"stringValue": value, "dataType": "String"} for name, value in attributes.items()},
+    }
+
+
+def _kinesis_record(sequence_number: str, data: bytes, stream: str = "orders") -> dict[str, Any]:
+    return {
+        "kinesis": {"sequenceNumber": sequence_number, "data": base64.b64encode(data).decode("ascii")},
+        "eventSource": "aws:kinesis",
+        "eventSourceARN": f"arn:aws:kinesis:us-east-1:123456789012:stream/{stream}",
+    }
+
+
+@pytest.fixture(name="app")
+def app_fixture() -> Vial:
+    app = Vial("batch-app")
+
+    @app.post("/orders")
+    def orders() -> dict[str, str | None]:
+        if (body := request.get().body) == "invalid":
+            raise BadRequestError(VialError.UNKNOWN_ERROR.get("Invalid order"))
+        return {"body": body}
+
+    @app.post("/blobs")
+    def blobs() -> dict[str, int]:
+        return {"size": len(request.get().raw_body or b"")}
+
+    return app
+
+
+def test_all_succeeded(app: Vial, context: LambdaContext) -> None:
+    event = {"Records": [_sqs_record("1", "first"), _sqs_record("2", "second")]}
+    assert app.batch(event, context) == {"batchItemFailures": []}
+
+
+def test_partial_failure(app: Vial, context: LambdaContext) -> None:
+    event = {"Records": [_sqs_record("1", "first"), _sqs_record("2", "invalid"), _sqs_record("3", "x", "missing")]}
+    assert app.batch(event, context) == {"batchItemFailures": [{"itemIdentifier": "2"}, {"itemIdentifier": "3"}]}
+
+
+def test_kinesis_records(app: Vial, context: LambdaContext) -> None:
+    event = {"Records": [_kinesis_record("10", b"first"), _kinesis_record("11", b"invalid")]}
+    assert app.batch(event, context) == {"batchItemFailures": [{"itemIdentifier": "11"}]}
+
+
+def test_binary_record(app: Vial, context: LambdaContext) -> None:
+    event = {"Records": [_kinesis_record("10", b"\xff\xfe", "blobs"), _kinesis_record("11", b"\xff\xfe")]}
+    assert app.batch(event, context) == {"batchItemFailures": [{"itemIdentifier": "11"}]}
+
+
+def test_unreadable_record(app: Vial, context: LambdaContext) -> None:
+    event = {"Records": [{"kinesis": {"sequenceNumber": "10"}}]}
+    assert app.batch(event, context) == {"batchItemFailures": [{"itemIdentifier": "10"}]}
+
+
+def test_parallel_workers(app: Vial, context: LambdaContext) -> None:
+    threads: set[str] = set()
+
+    @app.post("/tracked")
+    def tracked() -> None:
+        threads.add(threading.current_thread().name)
+
+    records = [_sqs_record(str(index), "invalid" if index % 2 else "valid") for index in range(20)]
+    event = {"Records": records + [_sqs_record("20", "valid", "tracked")]}
+    failures = app.batch(event, context, max_workers=4)["batchItemFailures"]
+    assert failures == [{"itemIdentifier": str(index)} for index in range(1, 20, 2)]
+    assert all(name.startswith("batch-app") for name in threads)
+    assert app.batch(event, context, max_workers=4)["batchItemFailures"] == failures
+    assert list(app.batch_executors) == [4]
+
+
+def test_map_sqs_record(context: LambdaContext) -> None:
+    record = _sqs_record("1", "hello", "orders", trace="abc")
+    mapped = RecordMapper()(record, context)
+    assert mapped.event is record
+    assert mapped.method == HTTPMethod.POST
+    assert mapped.resource == mapped.path == "/orders"
+    assert mapped.headers["trace"] == ["abc"]
+    assert mapped.body == "hello"
+    assert RecordMapper.item_id(record) == "1"
+
+
+def test_map_kinesis_record(context: LambdaContext) -> None:
+    record = _kinesis_record("10", b"hello", "events")
+    mapped = RecordMapper()(record, context)
+    assert mapped.resource == "/events"
+    assert not mapped.headers
+    assert mapped.body == "hello"
+    assert mapped.raw_body == b"hello"
+    assert RecordMapper.item_id(record) == "10"
+
+
+def test_map_raw_body(context: LambdaContext) -> None:
+    assert RecordMapper()(_sqs_record("1", "hello"), context).raw_body == b"hello"
+    assert RecordMapper()({**_sqs_record("1", "hello"), "body": None}, context).raw_body is None
+    mapped = RecordMapper()(_kinesis_record("10", b"\x1f\x8b"), context)
+    assert mapped.raw_body == b"\x1f\x8b"
+    pytest.raises(UnicodeDecodeError, getattr, mapped, "body")
+
+
+def test_mapped_copied(context: LambdaContext) -> None:
+    mapped = RecordMapper()(_sqs_record("1", "hello", trace="abc"), context)
+    assert copy.deepcopy(mapped) == mapped
@@ -0,0 +1,45 @@
+from http import HTTPStatus
+
+from vial import request
+from vial.app import Vial
+from vial.gateway import Gateway
+from vial.types import HTTPMethod, Response
+
+app = Vial(__name__)
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR"
+
+
+@app.post("/images")
+def upload_image() -> Response:
+    raw_body = request.get().raw_body
+    return Response(bytes(raw_body[::-1]) if raw_body is not None else None, {"content-type": "image/png"})
+
+
+@app.get("/images/header")
+def get_image_header() -> Response:
+    return Response(PNG_HEADER, status=HTTPStatus.OK)
+
+
+def test_binary_request_and_response() -> None:
+    response = Gateway(app).post("/images", PNG_HEADER)
+    assert response.status == HTTPStatus.OK
+    assert response.body == PNG_HEADER[::-1]
+    assert response.headers == {"content-type": "image/png"}
+
+
+def test_binary_response_base64_encoded() -> None:
+    gateway = Gateway(app)
+    response = app(gateway.build_request(HTTPMethod.GET, "/images/header"), gateway.get_context())
+    assert response["isBase64Encoded"] is True
+    assert gateway.build_response(response).body == PNG_HEADER
+
+
+def test_text_raw_body() -> None:
+    response = Gateway(app).post("/images", "hello")
+    assert response.body == b"olleh"
+
+
+def test_no_raw_body() -> None:
+    response = Gateway(app).post("/images")
+    assert response.body is None
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import gzip
+import json
+import zlib
+from http import HTTPStatus
+from typing import Any
+
+import pytest
+
+from vial.app import Vial
+from vial.compression import CompressionMiddleware, add_vary, parse_accept_encoding
+from vial.gateway import Gateway
+from vial.types import MultiDict, Response, StreamingResponse
+
+app = Vial(__name__)
+
+app.register_middleware(CompressionMiddleware(app.json, threshold=100))
+
+LARGE_BODY = [{"id": i, "name": f"Item {i}"} for i in range(50)]
+
+
+@app.get("/large")
+def get_large() -> list[dict[str, Any]]:
+    return LARGE_BODY
+
+
+@app.get("/large-text")
+def get_large_text() -> str:
+    return "a" * 200
+
+
+@app.get("/small")
+def get_small() -> dict[str, str]:
+    return {"status": "OK"}
+
+
+@app.get("/encoded")
+def get_encoded() -> Response:
+    return Response(json.dumps("a" * 200), {"content-encoding": "identity"})
+
+
+@app.get("/varied")
+def get_varied() -> Response:
+    return Response(LARGE_BODY, {"vary": "Origin"})
+
+
+@app.get("/streamed")
+def get_streamed() -> StreamingResponse:
+    return StreamingResponse(iter(LARGE_BODY))
+
+
+@app.get("/empty")
+def get_empty() -> None:
+    return None
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("gzip", {"gzip": 1.0}),
+        ("gzip;q=0.5, deflate, br;q=0", {"gzip": 0.5, "deflate": 1.0, "br": 0.0}),
+        ("GZIP ; Q=0.2,, *;q=0.1", {"gzip": 0.2, "*": 0.1}),
+        ("gzip;q=invalid, deflate;level=1", {"gzip": 0.0, "deflate": 1.0}),
+        ("", {}),
+    ],
+)
+def test_parse_accept_encoding(header: str, expected: dict[str, float]) -> None:
+    assert parse_accept_encoding(header) == expected
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("gzip, deflate", "gzip"),
+        ("gzip;q=0.5, deflate", "deflate"),
+        ("*", next(iter(CompressionMiddleware(app.json).compressors))),
+        ("*, gzip;q=0, deflate;q=0", None),
+        ("identity", None),
+        ("gzip;q=0", None),
+    ],
+)
+def test_negotiate(header: str, expected: str | None) -> None:
+    assert CompressionMiddleware(app.json).negotiate(MultiDict({"Accept-Encoding": [header]})) == expected
+
+
+def test_negotiate_no_header() -> None:
+    assert CompressionMiddleware(app.json).negotiate(MultiDict()) is None
+
+
+def test_compress_gzip() -> None:
+    response = Gateway(app).get("/large", headers={"accept-encoding": "gzip"})
+    assert response.status == HTTPStatus.OK
+    assert response.headers == {"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+    assert isinstance(response.body, bytes)
+    assert json.loads(gzip.decompress(response.body)) == LARGE_BODY
+
+
+def test_compress_keeps_vary() -> None:
+    response = Gateway(app).get("/varied", headers={"accept-encoding": "gzip"})
+    assert response.headers == {"vary": "Origin, Accept-Encoding", "Content-Encoding": "gzip"}
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        ({}, {"Vary": "Accept-Encoding"}),
+        ({"Vary": "Origin, Cookie"}, {"Vary": "Origin, Cookie, Accept-Encoding"}),
+        ({"VARY": "accept-encoding"}, {"VARY": "accept-encoding"}),
+        ({"Vary": "*"}, {"Vary": "*"}),
+        ({"Vary": ""}, {"Vary": "Accept-Encoding"}),
+    ],
+)
+def test_add_vary(headers: dict[str, str], expected: dict[str, str]) -> None:
+    add_vary(headers, "Accept-Encoding")
+    assert headers == expected
+
+
+def test_compress_deflate_text() -> None:
+    response = Gateway(app).get("/large-text", headers={"accept-encoding": "deflate"})
+    assert isinstance(response.body, bytes)
+    assert zlib.decompress(response.body) == b"a" * 200
+
+
+@pytest.mark.parametrize("path", ["/small", "/encoded", "/streamed", "/empty"])
+def test_not_compressed(path: str) -> None:
+    response = Gateway(app).get(path, headers={"accept-encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    assert not isinstance(response.body, bytes)
+
+
+def test_not_accepted() -> None:
+    response = Gateway(app).get("/large")
+    assert "Content-Encoding" not in response.headers
+    assert response.body == LARGE_BODY
@@ -1,3 +1,4 @@
+import logging
 import os
 from unittest.mock import patch
 
@@ -9,3 +10,17 @@ def test_is_deployed() -> None:
 
     with patch.dict(os.environ, {"AWS_EXECUTION_ENV": "AWS_Lambda_python3.9"}):
         assert context.is_deployed()
+
+
+def test_get_log_level() -> None:
+    with patch.dict(os.environ, clear=True):
+        assert context.get_log_level(logging.DEBUG) == logging.DEBUG
+
+    with patch.dict(os.environ, {"AWS_LAMBDA_LOG_LEVEL": "WARN"}):
+        assert context.get_log_level(logging.DEBUG) == logging.WARNING
+
+    with patch.dict(os.environ, {"LOG_LEVEL": "info", "AWS_LAMBDA_LOG_LEVEL": "ERROR"}):
+        assert context.get_log_level(logging.DEBUG) == logging.INFO
+
+    with patch.dict(os.environ, {"LOG_LEVEL": "verbose"}, clear=True):
+        assert context.get_log_level(logging.DEBUG) == logging.DEBUG
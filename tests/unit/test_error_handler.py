@@ -0,0 +1,47 @@
+from http import HTTPStatus
+
+from vial.errors import ErrorHandler
+from vial.exceptions import HTTPError, NotFoundError, ServerError, VialError
+from vial.types import Response
+
+
+class CustomError(ValueError):
+    pass
+
+
+def _teapot(_: Exception) -> Response:
+    return Response(status=HTTPStatus.IM_A_TEAPOT)
+
+
+def test_handler_cached() -> None:
+    handler = ErrorHandler("cached")
+    assert handler("cached", CustomError("bad")).status == HTTPStatus.BAD_REQUEST
+    resolved = handler.resolved[("cached", CustomError)]
+    assert handler.get_handler("cached", CustomError) is resolved
+    assert handler.statuses[CustomError] == HTTPStatus.BAD_REQUEST
+
+
+def test_cache_invalidated() -> None:
+    handler = ErrorHandler("invalidated")
+    assert handler("invalidated", CustomError("bad")).status == HTTPStatus.BAD_REQUEST
+    handler.register_handler(ValueError, _teapot)
+    assert not handler.resolved
+    assert handler("invalidated", CustomError("bad")).status == HTTPStatus.IM_A_TEAPOT
+
+
+def test_resource_handler_preferred() -> None:
+    handler = ErrorHandler("global")
+    handler.error_handlers["resource"][NotFoundError] = _teapot
+    error = NotFoundError(VialError.ROUTE_NOT_FOUND.get("/missing"))
+    assert handler("resource", error).status == HTTPStatus.IM_A_TEAPOT
+    assert handler("global", error).status == HTTPStatus.NOT_FOUND
+    assert handler("other", error).status == HTTPStatus.NOT_FOUND
+
+
+def test_freeze_resolves_http_errors() -> None:
+    handler = ErrorHandler("frozen")
+    handler.freeze()
+    assert ("frozen", HTTPError) in handler.resolved
+    assert ("frozen", ServerError) in handler.resolved
+    assert ("frozen", NotFoundError) in handler.resolved
+    assert ("frozen", CustomError) not in handler.resolved
@@ -0,0 +1,37 @@
+import subprocess
+import sys
+
+import pytest
+
+import vial.json
+from vial.orjson_json import OrjsonJson
+
+# Only imported once a feature that needs them is used
+LAZY_MODULES = ("asyncio", "concurrent.futures", "uuid", "decimal", "orjson", "simplejson", "ujson")
+
+
+def _import_times(module: str) -> dict[str, int]:
+    command = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+    output = subprocess.run(command, capture_output=True, check=True, text=True).stderr
+    cumulative_times: dict[str, int] = {}
+    for line in output.splitlines()[1:]:
+        _, cumulative, name = line.split("|")
+        cumulative_times[name.strip()] = int(cumulative)
+    return cumulative_times
+
+
+def test_lazy_features() -> None:
+    imported = _import_times("vial.app")
+    assert not [name for name in ("vial.instrumentation", "vial.matchers") if name in imported]
+
+
+@pytest.mark.parametrize("module", ["vial.app", "vial.gateway"])
+def test_lazy_modules(module: str) -> None:
+    imported = _import_times(module)
+    assert not [name for name in LAZY_MODULES if name in imported]
+
+
+def test_lazy_orjson() -> None:
+    assert vial.json.OrjsonJson is OrjsonJson
+    with pytest.raises(AttributeError):
+        assert not vial.json.UnknownJson
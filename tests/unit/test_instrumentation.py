@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import logging
+from http import HTTPStatus
+from typing import Any
+
+import pytest
+
+from vial.app import Vial
+from vial.gateway import Gateway
+from vial.instrumentation import LogSink, ServerTimingSink, Timings, record
+from vial.middleware import AsyncCallChain, CallChain
+from vial.types import Request, Response
+
+
+class CollectingSink:
+    def __init__(self) -> None:
+        self.timings: list[Timings] = []
+
+    def __call__(self, request: Request, response: Response, timings: Timings) -> None:
+        self.timings.append(timings)
+
+
+def log_events(event: Request, chain: CallChain) -> Response:
+    return chain(event)
+
+
+async def add_header(event: Request, chain: AsyncCallChain) -> Response:
+    response = await chain(event)
+    response.headers["added"] = "true"
+    return response
+
+
+@pytest.fixture(name="sink")
+def sink_fixture() -> CollectingSink:
+    return CollectingSink()
+
+
+@pytest.fixture(name="app")
+def app_fixture(sink: CollectingSink) -> Vial:
+    app = Vial("instrumented")
+    app.logger.disabled = True
+    app.register_middleware(log_events)
+    app.register_middleware(add_header)
+    app.instrument(sink, ServerTimingSink())
+
+    @app.get("/health")
+    def health() -> dict[str, str]:
+        return {"status": "OK"}
+
+    @app.get("/error")
+    def error() -> None:
+        raise ValueError("Failed")
+
+    return app
+
+
+def test_timings(app: Vial, sink: CollectingSink) -> None:
+    response = Gateway(app).get("/health")
+    assert response.status == HTTPStatus.OK
+    assert response.headers["added"] == "true"
+    timings = sink.timings[0]
+    expected = ["request", "resolve", "middleware.log_events", "middleware.add_header", "handler", "serialize"]
+    assert list(timings) == expected
+    assert all(duration > 0 for duration in timings.values())
+    assert timings["middleware.log_events"] >= timings["handler"]
+
+
+def test_error_timings(app: Vial, sink: CollectingSink) -> None:
+    assert Gateway(app).get("/error").status == HTTPStatus.BAD_REQUEST
+    assert "error" in sink.timings[0]
+
+
+def test_server_timing_header(app: Vial) -> None:
+    header = Gateway(app).get("/health").headers["Server-Timing"]
+    entries = [entry.split(";dur=") for entry in header.split(", ")]
+    assert [name for name, _ in entries][:2] == ["request", "resolve"]
+    assert all(float(duration) >= 0 for _, duration in entries)
+
+
+def test_log_sink(caplog: pytest.LogCaptureFixture) -> None:
+    app = Vial("logged-timings")
+    logger = logging.getLogger("timings")
+    app.instrument(LogSink(logger))
+    app.get("/health")(lambda: None)
+    with caplog.at_level(logging.INFO, logger="timings"):
+        Gateway(app).get("/health")
+    assert caplog.records[0].getMessage().startswith("GET /health 200 timings {'request': ")
+
+
+def test_record_outside_invocation(app: Vial, sink: CollectingSink) -> None:
+    record("ignored", 10)
+    Gateway(app).get("/health")
+    assert "ignored" not in sink.timings[0]
+
+
+def test_not_instrumented() -> None:
+    app = Vial("not-instrumented")
+    calls: list[Any] = []
+    app.register_middleware(log_events)
+    app.get("/health")(lambda: calls.append(True))
+    assert "Server-Timing" not in Gateway(app).get("/health").headers
+    assert app.resolve_route is app.route_resolver
+    assert calls == [True]
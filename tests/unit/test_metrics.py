@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+from logging import Handler, Logger, LogRecord
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from vial import metrics
+from vial.app import Vial
+from vial.exceptions import NotFoundError, ServerError, VialError
+from vial.gateway import Gateway
+from vial.metrics import Metrics, MetricsFormatter, MetricsLoggerFactory, MetricsSink
+
+
+class CollectingHandler(Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.logs: list[str] = []
+        self.setFormatter(MetricsFormatter())
+
+    def emit(self, record: LogRecord) -> None:
+        self.logs.append(self.format(record))
+
+
+@pytest.fixture(name="handler")
+def handler_fixture() -> CollectingHandler:
+    return CollectingHandler()
+
+
+@pytest.fixture(name="logger")
+def logger_fixture(request: pytest.FixtureRequest, handler: CollectingHandler) -> Logger:
+    log = logging.getLogger(request.function.__name__)
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    log.addHandler(handler)
+    return log
+
+
+def _build_app(logger: Logger, phase_timings: bool = False) -> Vial:
+    app = Vial("metrics")
+    app.logger.disabled = True
+    app.instrument(MetricsSink("Vial/Test", logger, phase_timings))
+
+    @app.get("/orders/{order_id}")
+    def get_order(order_id: str) -> dict[str, str]:
+        metrics.get().increment("OrdersRead")
+        metrics.get().increment("OrdersRead", 2)
+        metrics.get().record("PayloadSize", 128, "Bytes")
+        return {"id": order_id}
+
+    app.get("/failure")(_fail)
+    app.get("/missing")(_missing)
+    return app
+
+
+def _fail() -> None:
+    raise RuntimeError("Failed")
+
+
+def _missing() -> None:
+    raise NotFoundError(VialError.ROUTE_NOT_FOUND.get("/missing"))
+
+
+def _documents(handler: CollectingHandler) -> list[dict[str, Any]]:
+    return [json.loads(log) for log in handler.logs]
+
+
+def test_document(logger: Logger, handler: CollectingHandler) -> None:
+    Gateway(_build_app(logger)).get("/orders/123")
+    [document] = _documents(handler)
+    [definition] = document["_aws"]["CloudWatchMetrics"]
+    assert definition["Namespace"] == "Vial/Test"
+    assert definition["Dimensions"] == [["Route", "Method", "Status"]]
+    units = {metric["Name"]: metric["Unit"] for metric in definition["Metrics"]}
+    assert units["OrdersRead"] == units["ClientErrors"] == units["ServerErrors"] == "Count"
+    assert units["PayloadSize"] == "Bytes"
+    assert units["Latency"] == "Milliseconds"
+
+
+def test_document_values(logger: Logger, handler: CollectingHandler) -> None:
+    Gateway(_build_app(logger)).get("/orders/123")
+    [document] = _documents(handler)
+    assert document["Route"] == "/orders/{order_id}"
+    assert document["Method"] == "GET"
+    assert document["Status"] == "200"
+    assert document["OrdersRead"] == 3
+    assert document["PayloadSize"] == [128]
+    assert document["ClientErrors"] == document["ServerErrors"] == 0
+    assert isinstance(document["_aws"]["Timestamp"], int)
+
+
+def test_errors(logger: Logger, handler: CollectingHandler) -> None:
+    gateway = Gateway(_build_app(logger))
+    gateway.get("/failure")
+    gateway.get("/missing")
+    server_error, client_error = _documents(handler)
+    assert (server_error["Status"], server_error["ServerErrors"], server_error["ClientErrors"]) == ("500", 1, 0)
+    assert (client_error["Status"], client_error["ServerErrors"], client_error["ClientErrors"]) == ("404", 0, 1)
+
+
+def test_phase_timings(logger: Logger, handler: CollectingHandler) -> None:
+    Gateway(_build_app(logger, phase_timings=True)).get("/orders/123")
+    [document] = _documents(handler)
+    assert all(len(document[phase]) == 1 for phase in ("request", "resolve", "handler", "serialize"))
+
+
+def test_custom_dimensions() -> None:
+    collected = Metrics()
+    collected.add_dimension("Tenant", "acme")
+    collected.increment("Requests")
+    document = collected.to_document("Vial/Test", 1000)
+    assert document["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [["Tenant"]]
+    assert document["Tenant"] == "acme"
+
+
+def test_get_outside_request() -> None:
+    pytest.raises(ServerError, metrics.get)
+
+
+def test_logged_above_configured_level(handler: CollectingHandler) -> None:
+    with patch.dict(os.environ, {"LOG_LEVEL": "WARNING"}):
+        sink = MetricsSink("Vial/Level")
+    sink.logger.handlers = [handler]
+    Gateway(_build_app(sink.logger)).get("/orders/123")
+    [document] = _documents(handler)
+    assert document["_aws"]["CloudWatchMetrics"][0]["Namespace"] == "Vial/Test"
+
+
+def test_default_logger(handler: CollectingHandler) -> None:
+    sink = MetricsSink("Vial/Default")
+    assert sink.logger.name == "Vial/Default.metrics"
+    assert isinstance(sink.logger.handlers[0].formatter, MetricsFormatter)
+    handler.setFormatter(MetricsLoggerFactory.get_handler().formatter)
+    record = LogRecord("name", logging.INFO, "file", 1, "Plain message", (), None)
+    assert json.loads(handler.format(record))["message"] == "Plain message"
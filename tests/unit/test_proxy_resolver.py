@@ -0,0 +1,60 @@
+from typing import Any
+
+import pytest
+
+from vial.app import ProxyRouteResolver, Vial
+from vial.exceptions import MethodNotAllowedError, NotFoundError
+from vial.gateway import Gateway
+from vial.types import HTTPMethod, LambdaContext, MultiDict, Request
+
+
+@pytest.fixture(name="app")
+def app_fixture() -> Vial:
+    app = Vial("proxy_resolver")
+    app.get("/stores/{store_id}")(lambda store_id: {"store_id": store_id})
+    app.get("/stores/{store_id}/items/{item_id}")(lambda store_id, item_id: {"item_id": item_id})
+    return app
+
+
+def test_resolve(app: Vial, context: LambdaContext) -> None:
+    request = _build_request(context, HTTPMethod.GET, "/stores/1/items/2/")
+    route = ProxyRouteResolver()(app.routes, request)
+    assert route.path == "/stores/{store_id}/items/{item_id}"
+    assert request.resource == route.path
+    assert request.event["pathParameters"] == {"store_id": "1", "item_id": "2"}
+
+
+def test_resolve_cached(app: Vial, context: LambdaContext) -> None:
+    resolver = ProxyRouteResolver()
+    for _ in range(3):
+        resolver(app.routes, _build_request(context, HTTPMethod.GET, "/stores/1"))
+    assert resolver.find.cache_info().hits == 2
+    assert resolver.find.cache_info().misses == 1
+
+
+def test_resolve_recompiled_on_new_routes(app: Vial, context: LambdaContext) -> None:
+    resolver = ProxyRouteResolver()
+    pytest.raises(NotFoundError, resolver, app.routes, _build_request(context, HTTPMethod.GET, "/health"))
+
+    app.get("/health")(lambda: {"status": "OK"})
+    assert resolver(app.routes, _build_request(context, HTTPMethod.GET, "/health")).path == "/health"
+
+
+def test_resolve_method_not_allowed(app: Vial, context: LambdaContext) -> None:
+    request = _build_request(context, HTTPMethod.DELETE, "/stores/1")
+    pytest.raises(MethodNotAllowedError, ProxyRouteResolver(), app.routes, request)
+
+
+def test_gateway_query_string(app: Vial) -> None:
+    class ProxyVial(Vial):
+        route_resolver_class = ProxyRouteResolver
+
+    proxy_app = ProxyVial("proxy_gateway")
+    proxy_app.register_routes(app)
+    response = Gateway(proxy_app).get("/stores/1/items/2?tag=a")
+    assert response.body == {"item_id": "2"}
+
+
+def _build_request(context: LambdaContext, method: HTTPMethod, path: str) -> Request:
+    event: dict[str, Any] = {"resource": "/{proxy+}", "path": path, "pathParameters": {"proxy": path[1:]}}
+    return Request(event, context, method, "/{proxy+}", path, MultiDict(), MultiDict(), None)
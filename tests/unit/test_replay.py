@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from vial import replay, request
+from vial.app import Vial
+from vial.gateway import Gateway
+from vial.replay import Replayer
+from vial.server import TOTAL
+from vial.types import HTTPMethod, Response
+
+app = Vial("replay-app")
+
+RESOURCES = Path(__file__).parent.parent / "resources"
+
+SLEEP = 0.01
+
+
+@app.get("/status")
+def status() -> Response:
+    return Response({"status": "OK"}, {"Date": request.get().context.aws_request_id})
+
+
+@app.post("/some/{some_value}/paths")
+def create_path(some_value: str) -> dict[str, Any]:
+    return {"value": some_value, **app.json.loads(request.get().body or "{}")}
+
+
+@app.get("/sleep")
+def sleep() -> None:
+    time.sleep(SLEEP)
+
+
+@pytest.fixture(name="events")
+def events_fixture(tmp_path: Path) -> Path:
+    events = [
+        json.loads((RESOURCES / f"{name}.json").read_text())
+        for name in ("get-without-variables", "post-with-variables")
+    ]
+    path = tmp_path / "events.jsonl"
+    path.write_text("\n".join(json.dumps(event) for event in events * 3) + "\n\n")
+    return path
+
+
+def test_read_events() -> None:
+    assert list(replay.read_events(['{"resource": "/one"}', "", '{"resource": "/two"}\n'])) == [
+        {"resource": "/one"},
+        {"resource": "/two"},
+    ]
+
+
+def test_batched() -> None:
+    assert list(replay.batched([{"index": index} for index in range(5)], 2)) == [
+        [{"index": 0}, {"index": 1}],
+        [{"index": 2}, {"index": 3}],
+        [{"index": 4}],
+    ]
+
+
+@pytest.mark.parametrize("processes", [0, 1])
+def test_replay(events: Path, processes: int) -> None:
+    replayer = Replayer("tests.unit.test_replay", batch_size=2, processes=processes)
+    with events.open() as lines:
+        results = list(replayer.replay(replay.read_events(lines)))
+    assert [result.route for result in results] == ["/status", "/some/{some_value}/paths"] * 3
+    assert json.loads(results[1].response["body"]) == {
+        "value": "51ed5421-674d-4ebb-9aa5-da236ee97270",
+        "hello": "world",
+        "top": "kek",
+    }
+    summaries = replayer.statistics.summarize()
+    assert (summaries["/status"].requests, summaries["/some/{some_value}/paths"].requests) == (3, 3)
+
+
+@pytest.mark.parametrize("processes", [0, 1])
+def test_replay_throughput(processes: int) -> None:
+    replayer = Replayer("tests.unit.test_replay", batch_size=5, processes=processes)
+    event = Gateway(app).build_request(HTTPMethod.GET, "/sleep")
+    deque(replayer.replay([event] * 20), maxlen=0)
+    summary = replayer.statistics.summarize()[TOTAL]
+    assert summary.requests == 20
+    # A single worker can't run more requests per second than the sleep of each one allows
+    assert 0 < summary.throughput <= 1 / SLEEP
+
+
+def test_normalize() -> None:
+    response = {"statusCode": 200, "headers": {"Content-Type": "text/plain", "Date": "today"}, "body": "OK"}
+    assert replay.normalize(response, frozenset({"date"})) == {
+        "statusCode": 200,
+        "headers": {"content-type": "text/plain"},
+        "body": "OK",
+        "isBase64Encoded": False,
+    }
+
+
+def test_record_and_compare(events: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    baseline = tmp_path / "baseline.jsonl"
+    assert replay.main(["tests.unit.test_replay", str(events), "--record", str(baseline)]) == 0
+    assert len(baseline.read_text().splitlines()) == 6
+
+    arguments = ["tests.unit.test_replay", str(events), "--baseline", str(baseline)]
+    assert replay.main([*arguments, "--ignore-header", "Date", "--processes", "1"]) == 0
+    assert replay.main(arguments) == 1
+    output = capsys.readouterr().out
+    assert "/some/{some_value}/paths" in output
+    assert "3 responses differ from the baseline" in output
+    assert "#0 /status headers: expected {'date':" in output
+
+
+def test_missing_baseline(events: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    baseline = tmp_path / "baseline.jsonl"
+    baseline.write_text(json.dumps({"statusCode": 200, "headers": {}, "body": '{"status": "OK"}'}) + "\n")
+    arguments = ["tests.unit.test_replay", str(events), "--baseline", str(baseline), "--ignore-header", "date"]
+    assert replay.main(arguments) == 1
+    output = capsys.readouterr().out
+    assert "5 responses differ from the baseline" in output
+    assert "#1 /some/{some_value}/paths response: expected None" in output
+
+
+def test_format_differences() -> None:
+    differences = [replay.Difference(3, "/status", {"body": ("a" * 300, "b")})]
+    assert replay.format_differences(differences, limit=40).splitlines() == [
+        "1 responses differ from the baseline",
+        "#3 /status body: expected 'aaaaaaaaaaaaa",
+    ]
+    assert not replay.format_differences([])
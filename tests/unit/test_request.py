@@ -1,3 +1,7 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 from vial import request
@@ -33,3 +37,44 @@ def test_remaining_time(http_request: Request) -> None:
 
 def test_get_no_active_request() -> None:
     pytest.raises(ServerError, request.get)
+
+
+def test_nested_contexts(http_request: Request, context: LambdaContext) -> None:
+    other_request = Request({}, context, HTTPMethod.POST, "/other", "/other", MultiDict(), MultiDict(), None)
+    with RequestContext(http_request):
+        with RequestContext(other_request):
+            assert request.get() is other_request
+        assert request.get() is http_request
+    pytest.raises(ServerError, request.get)
+
+
+def test_propagate(http_request: Request) -> None:
+    with RequestContext(http_request), ThreadPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(request.propagate(request.get)).result() is http_request
+        pytest.raises(ServerError, executor.submit(request.get).result)
+
+
+def test_isolated_between_threads(context: LambdaContext) -> None:
+    barrier = threading.Barrier(4)
+
+    def serve(path: str) -> str:
+        event = Request({}, context, HTTPMethod.GET, path, path, MultiDict(), MultiDict(), None)
+        with RequestContext(event):
+            barrier.wait()
+            return request.get().path
+
+    paths = [f"/path/{index}" for index in range(4)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(executor.map(serve, paths)) == paths
+
+
+def test_isolated_between_tasks(context: LambdaContext) -> None:
+    async def serve(path: str) -> str:
+        with RequestContext(Request({}, context, HTTPMethod.GET, path, path, MultiDict(), MultiDict(), None)):
+            await asyncio.sleep(0)
+            return request.get().path
+
+    async def serve_all() -> list[str]:
+        return list(await asyncio.gather(serve("/first"), serve("/second")))
+
+    assert asyncio.run(serve_all()) == ["/first", "/second"]
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import http.client
+import json
+import signal
+import threading
+from http import HTTPStatus
+from typing import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from vial import request, server
+from vial.app import Vial
+from vial.gateway import Gateway
+from vial.server import TOTAL, UNMATCHED, LocalServer, ProcessInvoker, Statistics, Summary, ThreadInvoker
+from vial.types import HTTPMethod, LambdaContext, Response
+
+app = Vial("server-app")
+
+
+@app.get("/users/{user_id}")
+def get_user(user_id: str) -> dict[str, str | list[str]]:
+    current = request.get()
+    return {"id": user_id, "path": current.path, "tags": current.query_parameters.get("tag", [])}
+
+
+@app.post("/echo")
+def echo() -> dict[str, str | None]:
+    current = request.get()
+    return {"body": current.body, "type": current.headers.get_first("Content-Type")}
+
+
+@app.post("/size")
+def get_size() -> dict[str, int]:
+    return {"size": len(request.get().raw_body or b"")}
+
+
+@app.get("/binary")
+def get_binary() -> Response:
+    return Response(b"\x00\xffbinary", {"Content-Type": "application/octet-stream"})
+
+
+@app.get("/failure")
+def get_failure() -> None:
+    raise ValueError("Invalid value")
+
+
+@app.get("/crash")
+def get_crash() -> None:
+    raise RuntimeError("Crashed")
+
+
+@pytest.fixture(name="local_server")
+def local_server_fixture() -> Iterator[LocalServer]:
+    local_server = LocalServer(("127.0.0.1", 0), app, ThreadInvoker(app, 2))
+    thread = threading.Thread(target=local_server.serve_forever, daemon=True)
+    thread.start()
+    yield local_server
+    local_server.shutdown()
+    local_server.server_close()
+    local_server.invoker.shutdown()
+
+
+def _request(
+    local_server: LocalServer, method: str, path: str, body: bytes | None = None, headers: dict[str, str] | None = None
+) -> http.client.HTTPResponse:
+    connection = http.client.HTTPConnection("127.0.0.1", local_server.server_port)
+    connection.request(method, path, body, headers or {})
+    response = connection.getresponse()
+    response.read()
+    connection.close()
+    return response
+
+
+def _json(local_server: LocalServer, method: str, path: str, body: bytes | None = None) -> object:
+    connection = http.client.HTTPConnection("127.0.0.1", local_server.server_port)
+    connection.request(method, path, body, {"Content-Type": "text/plain"})
+    body = connection.getresponse().read()
+    connection.close()
+    return json.loads(body)
+
+
+def test_path_parameters(local_server: LocalServer) -> None:
+    result = _json(local_server, "GET", "/users/123?tag=a&tag=b")
+    assert result == {"id": "123", "path": "/users/123", "tags": ["a", "b"]}
+
+
+def test_text_body(local_server: LocalServer) -> None:
+    assert _json(local_server, "POST", "/echo", b"hello") == {"body": "hello", "type": "text/plain"}
+
+
+def test_binary_bodies(local_server: LocalServer) -> None:
+    connection = http.client.HTTPConnection("127.0.0.1", local_server.server_port)
+    connection.request("POST", "/size", b"\xff\xfe")
+    assert json.loads(connection.getresponse().read()) == {"size": 2}
+    connection.request("GET", "/binary")
+    response = connection.getresponse()
+    assert response.read() == b"\x00\xffbinary"
+    assert response.getheader("Content-Type") == "application/octet-stream"
+    connection.close()
+
+
+def test_empty_body(local_server: LocalServer) -> None:
+    response = _request(local_server, "GET", "/failure")
+    assert response.status == HTTPStatus.BAD_REQUEST
+    with patch.object(app.json, "dumps", return_value=""):
+        assert _request(local_server, "GET", "/users/1").getheader("Content-Length") == "0"
+
+
+def test_not_found(local_server: LocalServer) -> None:
+    response = _request(local_server, "GET", "/missing")
+    assert response.status == HTTPStatus.NOT_FOUND
+    assert local_server.statistics.summarize()[UNMATCHED].requests == 1
+
+
+def test_statistics(local_server: LocalServer) -> None:
+    for _ in range(3):
+        _request(local_server, "GET", "/users/1")
+    _request(local_server, "GET", "/crash")
+    summaries = local_server.statistics.summarize()
+    assert list(summaries) == [TOTAL, "/crash", "/users/{user_id}"]
+    assert (summaries[TOTAL].requests, summaries[TOTAL].errors) == (4, 1)
+    assert (summaries["/users/{user_id}"].requests, summaries["/users/{user_id}"].errors) == (3, 0)
+    assert summaries[TOTAL].p50 <= summaries[TOTAL].p99 <= summaries[TOTAL].max
+    assert summaries[TOTAL].throughput > 0
+
+
+def test_summary() -> None:
+    summary = Summary.of([4_000_000, 1_000_000, 2_000_000, 3_000_000], 1, 2_000_000_000)
+    assert summary == Summary(4, 1, 2.0, 2.5, 3.0, 4.0, 4.0, 4.0)
+    assert Summary.of([1_000_000], 0, 0).throughput == 0.0
+    assert not Statistics().summarize()
+
+
+def test_report() -> None:
+    report = server.format_report({TOTAL: Summary(2, 0, 10.0, 1.5, 1.0, 2.0, 2.0, 2.0)})
+    assert report.splitlines()[1].split() == ["*", "2", "0", "10.00", "1.50", "1.00", "2.00", "2.00", "2.00"]
+
+
+def test_process_invoker(context: LambdaContext) -> None:
+    assert server.load_app("tests.unit.test_server") is app
+    assert server.load_app("tests.unit.test_server:app") is app
+    with patch("signal.signal") as set_handler:
+        server.initialize_worker("tests.unit.test_server")
+    set_handler.assert_called_once_with(signal.SIGINT, signal.SIG_IGN)
+    event = Gateway(app).build_request(HTTPMethod.GET, "/users/2")
+    assert json.loads(server.invoke_app("tests.unit.test_server", event, context)["body"])["id"] == "2"
+    invoker = ProcessInvoker("tests.unit.test_server", 1)
+    assert json.loads(invoker(event, context)["body"])["id"] == "2"
+    invoker.shutdown()
+
+
+def test_main() -> None:
+    with patch.object(LocalServer, "serve_forever", side_effect=KeyboardInterrupt), patch("sys.stderr") as stderr:
+        server.main(["tests.unit.test_server", "--port", "0", "--workers", "1"])
+        server.main(["tests.unit.test_server", "--port", "0", "--processes"])
+    assert "Serving tests.unit.test_server on http://127.0.0.1:" in stderr.write.call_args_list[0].args[0]
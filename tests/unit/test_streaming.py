@@ -0,0 +1,110 @@
+import json
+from http import HTTPStatus
+from typing import Any, Iterator
+
+import pytest
+
+from vial.app import Vial
+from vial.gateway import Gateway
+from vial.json import NativeJson
+from vial.streaming import BufferedResponseWriter, encode_items
+from vial.types import HTTPMethod, Response, StreamingResponse
+
+app = Vial(__name__)
+
+
+def _generate_items(count: int) -> Iterator[dict[str, int]]:
+    for i in range(count):
+        yield {"id": i}
+
+
+@app.get("/items/{count:int}")
+def get_items(count: int) -> StreamingResponse:
+    return StreamingResponse(_generate_items(count), {"x-streamed": "true"}, chunk_size=2)
+
+
+@app.get("/text")
+def get_text() -> str:
+    return "plain text"
+
+
+@app.get("/object")
+def get_object() -> dict[str, str]:
+    return {"hello": "world"}
+
+
+@app.get("/binary")
+def get_binary() -> Response:
+    return Response(b"\x00\x01binary")
+
+
+@app.get("/empty")
+def get_empty() -> Response:
+    return Response(status=HTTPStatus.NO_CONTENT)
+
+
+@pytest.mark.parametrize("count", [0, 1, 2, 5])
+def test_encode_items(count: int) -> None:
+    items = list(_generate_items(count))
+    chunks = list(encode_items(NativeJson, iter(items), 2))
+    assert json.loads("".join(chunks)) == items
+    assert len(chunks) == 2 + (count + 1) // 2
+
+
+def test_call_streaming_response() -> None:
+    response = Gateway(app).get("/items/5")
+    assert response.status == HTTPStatus.OK
+    assert response.headers == {"x-streamed": "true"}
+    assert response.body == list(_generate_items(5))
+
+
+def test_stream() -> None:
+    prelude, body, _ = _stream("/items/3")
+    assert prelude == {"statusCode": HTTPStatus.OK, "headers": {"x-streamed": "true"}}
+    assert json.loads(body) == list(_generate_items(3))
+
+
+def test_stream_chunks() -> None:
+    _, _, writer = _stream("/items/4")
+    assert writer.closed
+    assert writer.chunks[1:] == [b"[", b'{"id": 0},{"id": 1}', b',{"id": 2},{"id": 3}', b"]"]
+
+
+def test_stream_text() -> None:
+    prelude, body, _ = _stream("/text")
+    assert prelude["statusCode"] == HTTPStatus.OK
+    assert body == b"plain text"
+
+
+def test_stream_object() -> None:
+    _, body, _ = _stream("/object")
+    assert json.loads(body) == {"hello": "world"}
+
+
+def test_stream_binary() -> None:
+    _, body, _ = _stream("/binary")
+    assert body == b"\x00\x01binary"
+
+
+def test_stream_empty() -> None:
+    prelude, body, _ = _stream("/empty")
+    assert prelude["statusCode"] == HTTPStatus.NO_CONTENT
+    assert not body
+
+
+def _stream(path: str) -> tuple[dict[str, Any], bytes, BufferedResponseWriter]:
+    gateway = Gateway(app)
+    writer = BufferedResponseWriter()
+    app.stream(gateway.build_request(HTTPMethod.GET, path), gateway.get_context(), writer)
+    prelude, body = writer.read()
+    return json.loads(prelude), body, writer
+
+
+def test_stream_freezes() -> None:
+    streaming_app = Vial("streaming-frozen")
+    streaming_app.get("/text")(get_text)
+    gateway = Gateway(streaming_app)
+    streaming_app.stream(
+        gateway.build_request(HTTPMethod.GET, "/text"), gateway.get_context(), BufferedResponseWriter()
+    )
+    assert streaming_app.frozen
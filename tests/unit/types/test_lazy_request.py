@@ -0,0 +1,98 @@
+import base64
+import copy
+import dataclasses
+from typing import Any
+
+import pytest
+
+from vial.types import HTTPMethod, LambdaContext, LazyRequest, MultiDict, Request
+
+
+@pytest.fixture(name="event")
+def event_fixture() -> dict[str, Any]:
+    return {
+        "httpMethod": "POST",
+        "resource": "/users/{user_id}",
+        "path": "/users/12345",
+        "multiValueHeaders": {"accept": ["application/json"]},
+        "multiValueQueryStringParameters": {"expand": ["addresses"]},
+        "body": base64.b64encode(b'{"name": "John"}').decode("utf-8"),
+        "isBase64Encoded": True,
+    }
+
+
+def decoded(request: LazyRequest) -> set[str]:
+    """Names of the filled slots, read without going through __getattr__, which would decode the empty ones."""
+    names = {field.name for field in dataclasses.fields(Request)} | {"raw_body"}
+    filled = set()
+    for name in names:
+        try:
+            object.__getattribute__(request, name)
+        except AttributeError:
+            continue
+        filled.add(name)
+    return filled
+
+
+def test_fields_decoded_lazily(event: dict[str, Any], context: LambdaContext) -> None:
+    request = LazyRequest(event, context)
+    assert decoded(request) == {"event", "context"}
+
+    assert request.headers.get_first("accept") == "application/json"
+    assert decoded(request) == {"event", "context", "headers"}
+    assert not hasattr(request, "__dict__")
+
+
+def test_unknown_attribute(event: dict[str, Any], context: LambdaContext) -> None:
+    with pytest.raises(AttributeError, match="'LazyRequest' object has no attribute 'unknown'"):
+        assert not LazyRequest(event, context).unknown
+
+
+def test_same_fields_as_request(event: dict[str, Any], context: LambdaContext) -> None:
+    expected = Request(
+        event,
+        context,
+        HTTPMethod.POST,
+        "/users/{user_id}",
+        "/users/12345",
+        MultiDict({"accept": ["application/json"]}),
+        MultiDict({"expand": ["addresses"]}),
+        '{"name": "John"}',
+    )
+    request = LazyRequest(event, context)
+    assert all(getattr(request, field.name) == getattr(expected, field.name) for field in dataclasses.fields(Request))
+
+
+def test_fields_assignable(event: dict[str, Any], context: LambdaContext) -> None:
+    request = LazyRequest(event, context)
+    request.resource = "/users/me"
+    request.headers["accept"] = "text/plain"
+    assert request.resource == "/users/me"
+    assert request.headers["accept"] == ["text/plain"]
+
+
+def test_body_not_encoded(event: dict[str, Any], context: LambdaContext) -> None:
+    event.update(body="plain text", isBase64Encoded=False)
+    assert LazyRequest(event, context).body == "plain text"
+
+
+def test_raw_body(event: dict[str, Any], context: LambdaContext) -> None:
+    request = LazyRequest(event, context)
+    assert isinstance(request.raw_body, memoryview)
+    assert request.raw_body == b'{"name": "John"}'
+    assert decoded(request) == {"event", "context", "raw_body"}
+
+
+def test_copied(event: dict[str, Any], context: LambdaContext) -> None:
+    request = LazyRequest(event, context)
+    assert request.path == "/users/12345"
+    copied = copy.deepcopy(request)
+    assert decoded(copied) == {"event", "context"}
+    assert copied == request
+
+
+def test_raw_body_eager_request(context: LambdaContext) -> None:
+    request = Request({}, context, HTTPMethod.POST, "/", "/", MultiDict(), MultiDict(), "hello")
+    assert request.raw_body == b"hello"
+    request.body = None
+    assert request.raw_body is None
@@ -0,0 +1,62 @@
+import copy
+import dataclasses
+from dataclasses import dataclass
+from typing import Any
+
+import pytest
+
+from vial.routes import Route
+from vial.types import HTTPMethod, LambdaContext, MultiDict, Request, Response, StreamingResponse
+
+
+def build_request(context: LambdaContext) -> Request:
+    return Request({}, context, HTTPMethod.GET, "/users", "/users", MultiDict(), MultiDict({"id": ["1"]}), None)
+
+
+def build_route() -> Route:
+    return Route("/users/{user_id}", "/users/{user_id}", HTTPMethod.GET, {"user_id": str}, str, {"cached": True})
+
+
+def test_instances_without_dict(context: LambdaContext) -> None:
+    for value in (context, build_request(context), Response("body"), build_route(), StreamingResponse([])):
+        assert not hasattr(value, "__dict__")
+
+
+def test_fields_not_declared_twice() -> None:
+    assert vars(Request)["__slots__"] == ("method", "resource", "path", "headers", "query_parameters", "body")
+    assert [field.name for field in dataclasses.fields(Request)][:2] == ["event", "context"]
+
+
+def test_unknown_attribute_rejected() -> None:
+    with pytest.raises(AttributeError):
+        Response().unknown = True  # type: ignore[attr-defined]
+
+
+def test_frozen_route() -> None:
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        build_route().path = "/accounts"  # type: ignore[misc]
+
+
+def test_equality_and_repr(context: LambdaContext) -> None:
+    assert build_request(context) == build_request(context)
+    assert repr(Response("body")) == "Response(body='body', headers={}, status=<HTTPStatus.OK: 200>)"
+
+
+@pytest.mark.parametrize("value", [build_route(), Response({"id": 1}, {"ETag": "1"})])
+def test_copied(value: Any) -> None:
+    # Copies go through the same __getstate__ and __setstate__ as pickling, which sends contexts to worker processes
+    assert copy.deepcopy(value) == value
+
+
+def test_copied_context(context: LambdaContext) -> None:
+    assert copy.deepcopy(context) == context
+
+
+def test_subclass_keeps_dict(context: LambdaContext) -> None:
+    @dataclass
+    class TracedRequest(Request):
+        trace_id: str = "1"
+
+    request = TracedRequest({}, context, HTTPMethod.GET, "/", "/", MultiDict(), MultiDict(), None)
+    request.user = "admin"  # type: ignore[attr-defined] # pylint: disable=attribute-defined-outside-init
+    assert vars(request) == {"trace_id": "1", "user": "admin"}
@@ -1,15 +1,34 @@
+from __future__ import annotations
+
 import base64
-from typing import Any, Type, cast
+from functools import lru_cache, partial
+from http import HTTPStatus
+from logging import Logger
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Mapping, Type, cast
 
-from vial.errors import ErrorHandlingAPI
-from vial.exceptions import MethodNotAllowedError, NotFoundError, VialError
+from vial.batch import Record, RecordMapper
+from vial.errors import E, ErrorHandlingAPI
+from vial.exceptions import MethodNotAllowedError, NotFoundError, ServerError, VialError
 from vial.json import Json, NativeJson
-from vial.loggers import LoggerFactory
-from vial.middleware import CallChain, MiddlewareAPI, MiddlewareChain
-from vial.parsers import ParserAPI
+from vial.loggers import LoggerFactory, LogSampler, flush_buffers
+from vial.loops import EventLoopRunner
+from vial.middleware import CallChain, Middleware, MiddlewareAPI, build_chain, is_async
+from vial.parsers import Parser, ParserAPI
 from vial.request import RequestContext
 from vial.routes import Route, RoutingAPI
-from vial.types import HTTPMethod, LambdaContext, MultiDict, Request, Response
+from vial.streaming import ResponseWriter, encode_body, encode_prelude, encode_stream
+from vial.types import HTTPMethod, LambdaContext, LazyRequest, Request, Response, StreamingResponse
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from vial.instrumentation import Instrumentation, TimingSink
+    from vial.matchers import RouteTrie
+
+ChainKey = tuple[str, str, HTTPMethod]
+
+Resources = Mapping[str, Mapping[HTTPMethod, Route]]
 
 
 class RouteResolver:
@@ -22,10 +41,10 @@ class RouteResolver:
     This approach only works when using direct routes and won't work with Proxy+ integrations, which don't
     try to match against pre-defined resources. In such a use case, this class can be overridden with a
     custom implementation and used to replace the Vial#route_resolver_class class field. For this use case,
-    the vial.gateway.RouteMatcher class can be used to match conventional URLs to route resources.
+    the ProxyRouteResolver class can be used instead, which matches conventional URLs to route resources.
     """
 
-    def __call__(self, resources: dict[str, dict[HTTPMethod, Route]], request: Request) -> Route:
+    def __call__(self, resources: Resources, request: Request) -> Route:
         if not (defined_routes := resources.get(request.resource)):
             raise NotFoundError(VialError.ROUTE_NOT_FOUND.get(request.resource))
 
@@ -34,6 +53,51 @@ class RouteResolver:
 
         return route
 
+    def prepare(self, resources: Resources) -> None:
+        """Called once the routes of the application are final, to build any lookup structures ahead of time."""
+
+
+class ProxyRouteResolver(RouteResolver):
+    """
+    Resolver for Proxy+ integrations, where API Gateway forwards every request to a single resource and the
+    route has to be found from the request path instead. Paths are matched against a RouteTrie built from
+    the defined routes, and the matches for recently seen paths are kept in a bounded LRU cache.
+
+    The matched path parameters replace the "pathParameters" of the original event in place, and the request
+    resource is updated to the matched route so that the rest of the invocation behaves like a direct route.
+    """
+
+    cache_size = 1024
+
+    def __init__(self) -> None:
+        self.trie: RouteTrie | None = None
+        self.route_count = -1  # Compiled on the first request, or when the application is frozen
+        self.find = lru_cache(maxsize=self.cache_size)(self._find)
+
+    def __call__(self, resources: Resources, request: Request) -> Route:
+        if len(resources) != self.route_count:
+            self.compile(list(resources))
+        if not (found := self.find(request.path)):
+            raise NotFoundError(VialError.ROUTE_NOT_FOUND.get(request.path))
+        request.resource = found[0]
+        request.event["pathParameters"] = dict(found[1])
+        return super().__call__(resources, request)
+
+    def prepare(self, resources: Resources) -> None:
+        self.compile(list(resources))
+
+    def compile(self, routes: list[str]) -> None:
+        from vial.matchers import RouteTrie  # pylint: disable=import-outside-toplevel
+
+        self.trie = RouteTrie(routes)
+        self.route_count = len(routes)
+        self.find.cache_clear()
+
+    def _find(self, path: str) -> tuple[str, dict[str, str]] | None:
+        if path != "/" and path.endswith("/"):
+            path = path[:-1]
+        return cast("RouteTrie", self.trie).find(path.split("/"))
+
 
 class RouteInvoker:
     def __call__(self, route: Route, request: Request) -> Response:
@@ -51,6 +115,12 @@ class RouteInvoker:
         result = route.function(*args.values())
         return self._to_response(result)
 
+    async def invoke_async(self, route: Route, request: Request) -> Response:
+        """Counterpart of the regular invocation for coroutine route functions, awaiting their result."""
+        args = self._build_args(route, request)
+        result = await route.function(*args.values())
+        return self._to_response(result)
+
     @staticmethod
     def _to_response(result: Any) -> Response:
         if isinstance(result, Response):
@@ -85,13 +155,26 @@ class Vial(RoutingAPI, ParserAPI, MiddlewareAPI, ErrorHandlingAPI):
 
     json_class: Type[Json] = NativeJson
 
+    event_loop_runner_class = EventLoopRunner
+
+    record_mapper_class = RecordMapper
+
     def __init__(self, name: str) -> None:
         super().__init__(name)
-        self.name = name
         self.route_resolver = self.route_resolver_class()
         self.invoker = self.route_invoker_class()
         self.json = self.json_class()
         self.logger = self.logger_factory_class.get(name)
+        self.loop_runner = self.event_loop_runner_class()
+        self.invocation_chains: dict[ChainKey, CallChain] = {}
+        self.middleware_links: dict[int, tuple[Middleware, Middleware, bool]] = {}
+        self.frozen = False
+        self.instrumentation: Instrumentation | None = None
+        self.log_sampler: LogSampler | None = None
+        self.resolve_route: Callable[[Resources, Request], Route] = self.route_resolver
+        self.handle_error: Callable[[str, Exception], Response] = self.default_error_handler
+        self.record_mapper = self.record_mapper_class()
+        self.batch_executors: dict[int, ThreadPoolExecutor] = {}
 
     def register_resource(self, app: Resource) -> None:
         self.register_parsers(app)
@@ -99,56 +182,254 @@ class Vial(RoutingAPI, ParserAPI, MiddlewareAPI, ErrorHandlingAPI):
         self.register_middlewares(app)
         self.register_error_handlers(app)
 
+    def register_parser(self, name: str, parser: Parser) -> None:
+        self._invalidate("parsers")
+        super().register_parser(name, parser)
+
+    def register_parsers(self, other: ParserAPI) -> None:
+        self._invalidate("parsers")
+        super().register_parsers(other)
+
+    def register_middleware(self, middleware: Middleware) -> None:
+        self._invalidate("middleware")
+        super().register_middleware(middleware)
+
+    def register_middlewares(self, other: MiddlewareAPI) -> None:
+        self._invalidate("middleware")
+        super().register_middlewares(other)
+
+    def register_routes(self, other: RoutingAPI) -> None:
+        self._invalidate("routes")
+        super().register_routes(other)
+
+    def _register_route(
+        self, path: str, method: HTTPMethod, function: Callable[..., Any], metadata: dict[str, Any]
+    ) -> None:
+        self._invalidate("routes")
+        super()._register_route(path, method, function, metadata)
+
+    def register_error_handler(self, error_type: Type[Exception], handler: Callable[[E], Response]) -> None:
+        self._invalidate("error handlers")
+        super().register_error_handler(error_type, handler)
+
+    def register_error_handlers(self, other: ErrorHandlingAPI) -> None:
+        self._invalidate("error handlers")
+        super().register_error_handlers(other)
+
+    def _invalidate(self, registered: str) -> None:
+        """
+        Middleware chains are compiled once per route on first use, so they're discarded whenever something is
+        registered to never go stale. Nothing can be registered anymore once the application is frozen.
+        """
+        if self.frozen:
+            raise ServerError(VialError.APPLICATION_FROZEN.get(self.name, registered))
+        self.invocation_chains.clear()
+        self.middleware_links.clear()
+
+    def instrument(self, *sinks: TimingSink) -> None:
+        """
+        Enables timing of every phase of an invocation, building the request, resolving the route, each middleware,
+        the route function, handling errors and serializing the response. Once the response is ready, the timings
+        are passed to every sink, like ServerTimingSink or LogSink. Timings are only collected for invocations
+        going through Vial#__call__.
+        """
+        from vial.instrumentation import Instrumentation, timed  # pylint: disable=import-outside-toplevel
+
+        self._invalidate("instrumentation")
+        self.instrumentation = Instrumentation(list(sinks))
+        self.resolve_route = timed("resolve", self.route_resolver)
+        self.handle_error = timed("error", self.default_error_handler)
+
+    def sample_logs(self, rate: float, header: str | None = None, loggers: list[Logger] | None = None) -> None:
+        """
+        Enables DEBUG logs for the given fraction of invocations and batch records, and for requests with the debug
+        header when one is given, while every other one logs at the configured level. The loggers are set to DEBUG,
+        so their configured level has to be set beforehand. Only the application logger is sampled unless loggers
+        are given.
+        """
+        self.log_sampler = LogSampler(loggers or [self.logger], rate, header)
+
+    def freeze(self) -> None:
+        """
+        Compiles everything that would otherwise be built lazily while serving the first requests, the middleware
+        chain of every route, the lookup structures of the route resolver and the handlers of HTTP errors, and makes
+        the route and error handler tables read only. Calling this at the end of the module defining the application
+        moves that work into the init phase of a cold start. Nothing can be registered on the application once it's
+        frozen.
+        """
+        self._lock()
+        self.default_error_handler.freeze()
+        for methods in self.routes.values():
+            for route in methods.values():
+                self._get_invocation_chain(route)
+
+    def _lock(self) -> None:
+        """
+        Makes the route and error handler tables read only and prepares the route resolver, which the first invocation
+        of an application that wasn't frozen does on its own. Middleware chains are still compiled per route on first
+        use then, so the first request doesn't pay for the chains of every other route.
+        """
+        if self.frozen:
+            return
+        routes = {resource: MappingProxyType(dict(methods)) for resource, methods in self.routes.items()}
+        self.routes = MappingProxyType(routes)  # type: ignore[assignment]
+        self.route_resolver.prepare(self.routes)
+        self.default_error_handler.lock()
+        self.frozen = True
+
     def __call__(self, event: dict[str, Any], context: LambdaContext) -> dict[str, Any]:
+        """
+        Log records held by buffered handlers are written out before every entry point returns, as the Lambda
+        container can be frozen as soon as the invocation completes.
+        """
+        if not self.frozen:
+            self._lock()
+        try:
+            if self.instrumentation:
+                return self._instrumented_call(self.instrumentation, event, context)
+            return self._call(event, context)
+        finally:
+            flush_buffers()
+
+    def _call(self, event: dict[str, Any], context: LambdaContext) -> dict[str, Any]:
         request = self._build_request(event, context)
-        with RequestContext(request):
+        with self._request_context(request):
             response = self._handle_request(request)
             return self._to_lambda_response(response)
 
+    def _instrumented_call(
+        self, instrumentation: Instrumentation, event: dict[str, Any], context: LambdaContext
+    ) -> dict[str, Any]:
+        token = instrumentation.begin()
+        request: Request = instrumentation.measure("request", self._build_request, event, context)
+        with self._request_context(request):
+            response = self._handle_request(request)
+            lambda_response: dict[str, Any] = instrumentation.measure("serialize", self._to_lambda_response, response)
+            instrumentation.finish(token, request, response)  # Shares the headers dict with the Lambda response
+            return lambda_response
+
+    def stream(self, event: dict[str, Any], context: LambdaContext, writer: ResponseWriter) -> None:
+        """
+        Entry point for Lambda response streaming, where the status code and headers are written first, followed by
+        the body as it's being encoded. A StreamingResponse is then never held in memory in its entirety, only one
+        chunk of it at a time. Errors raised while streaming the body can't change the status that was already sent.
+        """
+        if not self.frozen:
+            self._lock()
+        request = self._build_request(event, context)
+        with self._request_context(request):
+            response = self._handle_request(request)
+            try:
+                writer.write(encode_prelude(self.json, response))
+                for chunk in encode_stream(self.json, response):
+                    writer.write(chunk)
+            finally:
+                flush_buffers()
+                writer.close()
+
+    def batch(self, event: dict[str, Any], context: LambdaContext, max_workers: int = 1) -> dict[str, Any]:
+        """
+        Entry point for SQS and Kinesis event sources, where every record of the batch is routed through the same
+        middleware and error handlers as an API Gateway request. Records whose response has an error status are
+        reported back as partial batch failures, so only those are retried, which requires ReportBatchItemFailures
+        to be enabled on the event source mapping. With more than one worker, records are processed in parallel by
+        a thread pool that's kept for following invocations. Coroutine routes run on the event loop of each worker.
+        """
+        if not self.frozen:
+            self._lock()
+        records: list[Record] = event["Records"]
+        try:
+            succeeded = self._handle_records(context, records, max_workers)
+        finally:
+            flush_buffers()
+        failures = [record for record, success in zip(records, succeeded) if not success]
+        return {"batchItemFailures": [{"itemIdentifier": self.record_mapper.item_id(record)} for record in failures]}
+
+    def _handle_records(self, context: LambdaContext, records: list[Record], max_workers: int) -> list[bool]:
+        if max_workers > 1:
+            return list(self._get_batch_executor(max_workers).map(partial(self._handle_record, context), records))
+        return [self._handle_record(context, record) for record in records]
+
+    def _get_batch_executor(self, max_workers: int) -> ThreadPoolExecutor:
+        if not (executor := self.batch_executors.get(max_workers)):
+            from concurrent.futures import ThreadPoolExecutor  # pylint: disable=import-outside-toplevel
+
+            executor = self.batch_executors[max_workers] = ThreadPoolExecutor(max_workers, thread_name_prefix=self.name)
+        return executor
+
+    def _handle_record(self, context: LambdaContext, record: Record) -> bool:
+        try:
+            request = self.record_mapper(record, context)
+        except Exception:  # pylint: disable=broad-except
+            self.logger.exception("Unable to read record %s", self.record_mapper.item_id(record))
+            return False
+        with self._request_context(request, self.record_mapper.item_id(record)):
+            return self._handle_request(request).status < HTTPStatus.BAD_REQUEST
+
+    def _request_context(self, request: Request, sample_id: str | None = None) -> RequestContext:
+        current = RequestContext(request)
+        current.sampled = self.log_sampler is not None and self.log_sampler.is_sampled(request, sample_id)
+        return current
+
     def _handle_request(self, request: Request) -> Response:
         route_resource = self.name  # If a route can't be found, default to the global application
         try:
-            route = self.route_resolver(self.routes, request)
+            route = self.resolve_route(self.routes, request)
             route_resource = route.resource
-            return self._build_invocation_chain(route)(request)
+            return self._get_invocation_chain(route)(request)
         except Exception as e:  # pylint: disable=broad-except
             self.logger.exception("Encountered uncaught exception")
-            return self.default_error_handler(route_resource, e)
+            return self.handle_error(route_resource, e)
+
+    def _get_invocation_chain(self, route: Route) -> CallChain:
+        key = (route.resource, route.path, route.method)
+        if not (chain := self.invocation_chains.get(key)):
+            chain = self.invocation_chains[key] = self._build_invocation_chain(route)
+        return chain
 
     def _build_invocation_chain(self, route: Route) -> CallChain:
-        def route_invocation(event: Request) -> Response:
-            return self.invoker(route, event)
+        """
+        Coroutine routes and middleware are awaited on the event loop of the loop runner, which outlives the
+        invocation so that warm invocations don't pay for creating a new loop every time.
+        """
+        invoke: Callable[[Route, Request], Any] = self.invoker
+        if is_async(route.function):
+            invoke = self.invoker.invoke_async
+        all_middleware = self.registered_middleware[self.name] + self.registered_middleware[route.resource]
+        links = [self._link_middleware(middleware) for middleware in all_middleware]
+        route_call: Callable[[Request], Any] = partial(invoke, route)
+        if self.instrumentation:
+            from vial.instrumentation import timed  # pylint: disable=import-outside-toplevel
 
-        if not (all_middleware := self.registered_middleware[self.name] + self.registered_middleware[route.resource]):
-            return route_invocation
+            route_call = timed("handler", route_call)
+        linked = [middleware for _, middleware, _ in links]
+        return build_chain(linked, [asynchronous for *_, asynchronous in links], route_call, self.loop_runner)
 
-        handler = MiddlewareChain(all_middleware[-1], route_invocation)
-        for middleware in reversed(all_middleware[0:-1]):
-            handler = MiddlewareChain(middleware, handler)
-        return handler
+    def _link_middleware(self, middleware: Middleware) -> tuple[Middleware, Middleware, bool]:
+        """
+        Middleware are shared by the chains of many routes, so the callable linked into the chains, timed when the
+        application is instrumented, and whether it's a coroutine are only worked out once per middleware. Entries
+        hold on to the registered middleware, so that its id can't be reused while it's cached.
+        """
+        if not (link := self.middleware_links.get(id(middleware))):
+            linked = middleware
+            if self.instrumentation:
+                from vial.instrumentation import middleware_name, timed  # pylint: disable=import-outside-toplevel
+
+                linked = timed(middleware_name(middleware), middleware)
+            link = self.middleware_links[id(middleware)] = (middleware, linked, is_async(middleware))
+        return link
 
     def _to_lambda_response(self, response: Response) -> dict[str, Any]:
-        if not isinstance(response.body, str):
-            body = self.json.dumps(response.body) if response.body is not None else None
-        else:
-            body = response.body
-        return {"headers": response.headers, "statusCode": response.status, "body": body}
+        if isinstance(response.body, bytes):
+            body = base64.b64encode(response.body).decode("ascii")
+            return {"headers": response.headers, "statusCode": response.status, "body": body, "isBase64Encoded": True}
+        return {"headers": response.headers, "statusCode": response.status, "body": self._encode_body(response)}
 
-    def _build_request(self, event: dict[str, Any], context: LambdaContext) -> Request:
-        return Request(
-            event,
-            context,
-            HTTPMethod[event["httpMethod"]],
-            event["resource"],
-            event["path"],
-            MultiDict(event["multiValueHeaders"]),
-            MultiDict(event["multiValueQueryStringParameters"]),
-            self._get_body(event),
-        )
+    def _encode_body(self, response: Response) -> str | None:
+        if response.body is None and not isinstance(response, StreamingResponse):
+            return None
+        return "".join(encode_body(self.json, response))
 
-    @staticmethod
-    def _get_body(event: dict[str, Any]) -> str:
-        body = event["body"]
-        if event.get("isBase64Encoded") and body:
-            return base64.b64decode(body).decode("utf-8")
-        return cast(str, body)
+    def _build_request(self, event: dict[str, Any], context: LambdaContext) -> Request:
+        return LazyRequest(event, context)
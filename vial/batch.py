@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import base64
+import re
+from typing import Any, Optional, cast
+
+from vial.types import HTTPMethod, LambdaContext, LazyRequest, MultiDict, Request
+
+Record = dict[str, Any]
+
+
+class RecordRequest(LazyRequest):
+    """
+    Request for a record of a batch, where the body is only decoded from the record when it's first read. The
+    decoded Kinesis data is available as bytes through raw_body, so records that aren't UTF-8 text, like compressed
+    or protobuf payloads, only fail in the routes that read them as text.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, record: Record, context: LambdaContext, resource: str, headers: MultiDict[str, str]) -> None:
+        super().__init__(record, context)
+        self.method = HTTPMethod.POST
+        self.resource = self.path = resource
+        self.headers = headers
+        self.query_parameters = MultiDict()
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return RecordRequest, (self.event, self.context, self.resource, self.headers)
+
+    def _decode_body(self) -> str | None:
+        if self.event.get("kinesis"):
+            return str(cast(memoryview, self.raw_body), "utf-8")
+        return cast(Optional[str], self.event.get("body"))
+
+    def _decode_raw_body(self) -> memoryview | None:
+        if kinesis := self.event.get("kinesis"):
+            return memoryview(base64.b64decode(kinesis["data"]))
+        if (body := self.event.get("body")) is None:
+            return None
+        return memoryview(body.encode("utf-8"))
+
+
+class RecordMapper:
+    """
+    Maps the records of an SQS or Kinesis event onto requests that can be routed like any other. Every record
+    becomes a POST request to the resource named after the queue or stream it was read from, so records from
+    the "orders" queue are routed to "/orders". The request body is the SQS message body or the decoded Kinesis
+    data, and string message attributes are passed as headers. Requests are built directly, without going
+    through a synthetic API Gateway event.
+    """
+
+    def __call__(self, record: Record, context: LambdaContext) -> Request:
+        return RecordRequest(record, context, self.resource(record), self.headers(record))
+
+    @staticmethod
+    def item_id(record: Record) -> str:
+        if kinesis := record.get("kinesis"):
+            return str(kinesis["sequenceNumber"])
+        return str(record["messageId"])
+
+    @staticmethod
+    def resource(record: Record) -> str:
+        return "/" + re.split("[:/]", record["eventSourceARN"])[-1]
+
+    @staticmethod
+    def headers(record: Record) -> MultiDict[str, str]:
+        attributes: dict[str, dict[str, Any]] = record.get("messageAttributes") or {}
+        return MultiDict({name: [value["stringValue"]] for name, value in attributes.items() if "stringValue" in value})
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import importlib
+from functools import lru_cache, partial
+from typing import Any, Callable
+
+from vial.json import Json
+from vial.middleware import CallChain
+from vial.types import MultiDict, Request, Response, StreamingResponse
+
+Compressor = Callable[[bytes], bytes]
+
+
+def load_compressor(module_name: str, **options: Any) -> Compressor | None:
+    """Returns the compress function of the given module bound to the options, if the module is installed."""
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError:  # pragma: no cover
+        return None
+    return partial(module.compress, **options)
+
+
+def _available(compressors: dict[str, Compressor | None]) -> dict[str, Compressor]:
+    return {encoding: compressor for encoding, compressor in compressors.items() if compressor}
+
+
+# Ordered by preference, the first encoding accepted by the client with the highest weight is used
+DEFAULT_COMPRESSORS = _available(
+    {
+        "br": load_compressor("brotli", quality=5),
+        "zstd": load_compressor("zstandard", level=3),
+        "gzip": load_compressor("gzip", compresslevel=6),
+        "deflate": load_compressor("zlib", level=6),
+    }
+)
+
+
+@lru_cache(maxsize=256)
+def parse_accept_encoding(header: str) -> dict[str, float]:
+    """Parses an Accept-Encoding header into a mapping of content codings to their quality values."""
+    weights: dict[str, float] = {}
+    for value in header.split(","):
+        coding, _, parameters = value.partition(";")
+        if coding := coding.strip().lower():
+            weights[coding] = _parse_quality(parameters)
+    return weights
+
+
+def _parse_quality(parameters: str) -> float:
+    name, _, quality = parameters.strip().partition("=")
+    try:
+        return float(quality) if name.strip().lower() == "q" else 1.0
+    except ValueError:
+        return 0.0
+
+
+def add_vary(headers: dict[str, str], name: str) -> None:
+    """Adds a header name to the Vary header, keeping the names already listed by the route under any casing."""
+    key = next((key for key in headers if key.lower() == "vary"), "Vary")
+    values = [value.strip() for value in headers.get(key, "").split(",") if value.strip()]
+    if not any(value == "*" or value.lower() == name.lower() for value in values):
+        headers[key] = ", ".join([*values, name])
+
+
+class CompressionMiddleware:
+    """
+    Compresses response bodies with the best content coding accepted by the client through its Accept-Encoding
+    header. Only bodies at least as large as the threshold are compressed, as the CPU cost of compressing
+    small payloads isn't worth the saved bytes. Compressed bodies are returned as bytes, so they're sent
+    base64 encoded. Streaming responses and bodies that are already bytes are left untouched.
+    """
+
+    def __init__(self, json: Json, threshold: int = 1024, compressors: dict[str, Compressor] | None = None) -> None:
+        self.json = json
+        self.threshold = threshold
+        self.compressors = compressors if compressors is not None else DEFAULT_COMPRESSORS
+
+    def __call__(self, event: Request, chain: CallChain) -> Response:
+        response = chain(event)
+        if not (encoding := self.negotiate(event.headers)):
+            return response
+        if not (body := self._encode(response)) or len(body) < self.threshold:
+            return response
+        response.body = self.compressors[encoding](body)
+        response.headers["Content-Encoding"] = encoding
+        add_vary(response.headers, "Accept-Encoding")
+        return response
+
+    def negotiate(self, headers: MultiDict[str, str]) -> str | None:
+        header = ",".join(next((values for name, values in headers.items() if name.lower() == "accept-encoding"), []))
+        weights = parse_accept_encoding(header)
+        default_weight = weights.get("*", 0.0)
+        best = max(self.compressors, key=lambda encoding: weights.get(encoding, default_weight), default=None)
+        return best if best and weights.get(best, default_weight) > 0 else None
+
+    def _encode(self, response: Response) -> bytes | None:
+        if isinstance(response, StreamingResponse) or isinstance(response.body, bytes) or response.body is None:
+            return None
+        if any(name.lower() == "content-encoding" for name in response.headers):
+            return None
+        body = response.body if isinstance(response.body, str) else self.json.dumps(response.body)
+        return body.encode("utf-8")
@@ -1,5 +1,16 @@
+import logging
 import os
 
+# Checked in order, LOG_LEVEL allows overriding the level configured through Lambda's advanced logging controls
+LOG_LEVEL_VARIABLES = ("LOG_LEVEL", "AWS_LAMBDA_LOG_LEVEL")
+
 
 def is_deployed() -> bool:
     return bool(os.getenv("AWS_EXECUTION_ENV"))
+
+
+def get_log_level(default: int) -> int:
+    for variable in LOG_LEVEL_VARIABLES:
+        if (value := os.getenv(variable)) and isinstance(level := logging.getLevelName(value.upper()), int):
+            return level
+    return default
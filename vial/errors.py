@@ -1,15 +1,29 @@
 from __future__ import annotations
 
-import dataclasses
 from collections import defaultdict
 from http import HTTPStatus
-from typing import Callable, Type, TypeVar, cast
+from types import MappingProxyType
+from typing import Callable, Mapping, Type, TypeVar, cast
 
 from vial.exceptions import HTTPError, ServerError, VialError
+from vial.json import to_dict
 from vial.types import Response
 
 E = TypeVar("E", bound=Exception)
 
+Handler = Callable[[Exception], Response]
+
+Handlers = Mapping[Type[Exception], Handler]
+
+NO_HANDLERS: Handlers = MappingProxyType({})
+
+
+def _subclasses(class_: Type[E]) -> list[Type[E]]:
+    subclasses = [class_]
+    for subclass in class_.__subclasses__():
+        subclasses.extend(_subclasses(subclass))
+    return subclasses
+
 
 class ErrorHandler:
     DEFAULT_STATUSES = {
@@ -20,44 +34,81 @@ class ErrorHandler:
 
     def __init__(self, name: str) -> None:
         self.name = name
-        self.error_handlers: dict[str, dict[Type[Exception], Callable[[Exception], Response]]] = defaultdict(dict)
+        self.error_handlers: dict[str, dict[Type[Exception], Handler]] = defaultdict(dict)
+        self.resolved: dict[tuple[str, Type[Exception]], Handler] = {}
+        self.statuses: dict[Type[Exception], HTTPStatus] = {}
         self.register_handler(Exception, self._default_handler)
         self.register_handler(HTTPError, self._http_error_handler)
         self.register_handler(ServerError, self._server_error_handler)
 
     def register_handler(self, error_type: Type[Exception], handler: Callable[[E], Response]) -> None:
-        self.error_handlers[self.name][error_type] = cast(Callable[[Exception], Response], handler)
+        self.error_handlers[self.name][error_type] = cast(Handler, handler)
+        self.resolved.clear()
+
+    def lock(self) -> None:
+        """Replaces the handler tables with read only copies, once no more handlers are going to be registered."""
+        frozen = {resource: MappingProxyType(dict(handlers)) for resource, handlers in self.error_handlers.items()}
+        self.error_handlers = MappingProxyType(frozen)  # type: ignore[assignment]
+        self.resolved.clear()
+
+    def freeze(self) -> None:
+        """
+        Locks the handler tables and resolves the handlers of every HTTPError subclass up front, as those make up
+        most of the handled errors.
+        """
+        self.lock()
+        for resource in self.error_handlers:
+            for error_type in _subclasses(HTTPError):
+                self.get_handler(resource, error_type)
 
     def __call__(self, resource: str, error: Exception) -> Response:
-        for error_type in type(error).__mro__:
-            if issubclass(error_type, Exception):
-                if handler := self._get_error_handler(resource, error_type):
-                    return handler(error)
-        return self._default_handler(error)
+        return self.get_handler(resource, type(error))(error)
 
-    def _get_error_handler(self, resource: str, error_type: Type[Exception]) -> Callable[[Exception], Response] | None:
+    def get_handler(self, resource: str, error_type: Type[Exception]) -> Handler:
+        """
+        Resolves the handler for an exception type by walking its MRO once, the result is cached per resource and
+        exception type so that repeated errors of the same kind only cost a single dict lookup.
+        """
+        try:
+            return self.resolved[(resource, error_type)]
+        except KeyError:
+            handler = self.resolved[(resource, error_type)] = self._resolve_handler(resource, error_type)
+            return handler
+
+    def _resolve_handler(self, resource: str, error_type: Type[Exception]) -> Handler:
+        for class_ in error_type.__mro__:
+            if issubclass(class_, Exception) and (handler := self._get_error_handler(resource, class_)):
+                return handler
+        return cast(Handler, self._default_handler)
+
+    def _get_error_handler(self, resource: str, error_type: Type[Exception]) -> Handler | None:
         """
         Tries to get the best matching error handler for the specified route. An error handler registered on a
         Resource rather than the global Vial application will always take precedence over the global erro handler.
         """
-        return self.error_handlers[resource].get(error_type) or self.error_handlers[self.name].get(error_type)
+        resource_handlers = self.error_handlers.get(resource, NO_HANDLERS)
+        return resource_handlers.get(error_type) or self.error_handlers.get(self.name, NO_HANDLERS).get(error_type)
 
     def _server_error_handler(self, error: ServerError) -> Response:
-        return Response(dataclasses.asdict(error.error), status=error.status)
+        return Response(to_dict(error.error), status=error.status)
 
     def _http_error_handler(self, error: HTTPError) -> Response:
-        body = dataclasses.asdict(VialError.UNKNOWN_ERROR.get(str(error)))
+        body = to_dict(VialError.UNKNOWN_ERROR.get(str(error)))
         return Response(body, status=error.status)
 
     def _default_handler(self, error: Exception) -> Response:
-        body = dataclasses.asdict(VialError.UNKNOWN_ERROR.get(str(error)))
+        body = to_dict(VialError.UNKNOWN_ERROR.get(str(error)))
         return Response(body, status=self._get_native_status_code(error))
 
     def _get_native_status_code(self, error: Exception) -> HTTPStatus:
-        for error_type in type(error).__mro__:
-            if issubclass(error_type, Exception):
-                if status := self.DEFAULT_STATUSES.get(error_type):
-                    return status
+        if not (status := self.statuses.get(type(error))):
+            status = self.statuses[type(error)] = self._resolve_status(type(error))
+        return status
+
+    def _resolve_status(self, error_type: Type[Exception]) -> HTTPStatus:
+        for class_ in error_type.__mro__:
+            if issubclass(class_, Exception) and (status := self.DEFAULT_STATUSES.get(class_)):
+                return status
         return HTTPStatus.INTERNAL_SERVER_ERROR
 
 
@@ -85,3 +136,4 @@ class ErrorHandlingAPI:
 
     def register_error_handlers(self, other: ErrorHandlingAPI) -> None:
         self.default_error_handler.error_handlers[other.name] = other.default_error_handler.error_handlers[other.name]
+        self.default_error_handler.resolved.clear()
@@ -30,6 +30,7 @@ class VialError(ErrorCodeBuilder, Enum):
     PARSER_ALREADY_EXISTS = auto(), "Parser '{}' is already registered"
     NOT_IN_REQUEST = auto(), "Not currently within a request"
     INVALID_TIMESTAMP_ZONE = auto(), "Only UTC timestamps are supported, got {}"
+    APPLICATION_FROZEN = auto(), "Application '{}' is frozen, {} can no longer be registered"
     UNKNOWN_ERROR = auto(), "{}"
 
 
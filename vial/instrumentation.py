@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import time
+from contextvars import ContextVar, Token
+from logging import INFO, Logger
+from typing import Any, Callable, Protocol
+
+from vial.middleware import is_async
+from vial.types import Request, Response
+
+Timings = dict[str, int]
+
+_TIMINGS: ContextVar[Timings | None] = ContextVar("vial_timings", default=None)
+
+
+class TimingSink(Protocol):
+    def __call__(self, request: Request, response: Response, timings: Timings) -> None:
+        pass
+
+
+def record(name: str, duration: int) -> None:
+    """Adds a duration in nanoseconds to the timings of the current invocation, if it's being instrumented."""
+    if (timings := _TIMINGS.get()) is not None:
+        timings[name] = timings.get(name, 0) + duration
+
+
+def start(name: str) -> int:
+    """Reserves the position of a phase in the timings when it starts, so they're reported in the order they ran."""
+    if (timings := _TIMINGS.get()) is not None:
+        timings.setdefault(name, 0)
+    return time.perf_counter_ns()
+
+
+class Timer:
+    def __init__(self, name: str, function: Callable[..., Any]) -> None:
+        self.name = name
+        self.function = function
+
+    def __call__(self, *args: Any) -> Any:
+        started = start(self.name)
+        try:
+            return self.function(*args)
+        finally:
+            record(self.name, time.perf_counter_ns() - started)
+
+
+class AsyncTimer:
+    def __init__(self, name: str, function: Callable[..., Any]) -> None:
+        self.name = name
+        self.function = function
+
+    async def __call__(self, *args: Any) -> Any:
+        started = start(self.name)
+        try:
+            return await self.function(*args)
+        finally:
+            record(self.name, time.perf_counter_ns() - started)
+
+
+def timed(name: str, function: Callable[..., Any]) -> Callable[..., Any]:
+    if is_async(function):
+        return AsyncTimer(name, function)
+    return Timer(name, function)
+
+
+def middleware_name(middleware: Callable[..., Any]) -> str:
+    return "middleware." + getattr(middleware, "__name__", type(middleware).__name__)
+
+
+class Instrumentation:
+    """
+    Collects the time spent in each phase of an invocation with time.perf_counter_ns and hands the timings over
+    to the sinks once the response is ready. Phases are timed by wrapping the callables that implement them once,
+    when the application is instrumented or its call chains are compiled, so applications that aren't instrumented
+    run exactly the same code as before. Middleware timings include everything called further down the chain.
+    """
+
+    def __init__(self, sinks: list[TimingSink]) -> None:
+        self.sinks = sinks
+
+    @staticmethod
+    def begin() -> Token[Timings | None]:
+        return _TIMINGS.set({})
+
+    @staticmethod
+    def measure(name: str, function: Callable[..., Any], *args: Any) -> Any:
+        started = start(name)
+        try:
+            return function(*args)
+        finally:
+            record(name, time.perf_counter_ns() - started)
+
+    def finish(self, token: Token[Timings | None], request: Request, response: Response) -> None:
+        timings = _TIMINGS.get() or {}
+        _TIMINGS.reset(token)
+        for sink in self.sinks:
+            sink(request, response, timings)
+
+
+class ServerTimingSink:
+    """Reports the timings to the client through a Server-Timing header, with durations in milliseconds."""
+
+    def __call__(self, request: Request, response: Response, timings: Timings) -> None:
+        response.headers["Server-Timing"] = ", ".join(
+            f"{name};dur={duration / 1_000_000:.3f}" for name, duration in timings.items()
+        )
+
+
+class LogSink:
+    """Logs the timings of every invocation as a single line, with durations in milliseconds."""
+
+    def __init__(self, logger: Logger, level: int = INFO) -> None:
+        self.logger = logger
+        self.level = level
+
+    def __call__(self, request: Request, response: Response, timings: Timings) -> None:
+        durations = {name: round(duration / 1_000_000, 3) for name, duration in timings.items()}
+        self.logger.log(
+            self.level, "%s %s %d timings %s", request.method.name, request.path, response.status, durations
+        )
@@ -1,9 +1,14 @@
+from __future__ import annotations
+
 import dataclasses
+import importlib
+import importlib.util
 import json
+import sys
 from enum import Enum
 from json.encoder import JSONEncoder
+from operator import attrgetter
 from typing import Any, Callable, Protocol, Type
-from uuid import UUID
 
 
 class Json(Protocol):
@@ -16,32 +21,128 @@ class Json(Protocol):
         pass
 
 
+Encoder = Callable[[Any], Any]
+
+TypeMatcher = Callable[[Any], bool]
+
+
 def _enum_to_string(value: Enum) -> str:
     return value.name
 
 
-def _instance_check(class_: Type[Any]) -> Callable[[Any], bool]:
-    def instance_checker(value: Any) -> bool:
-        return isinstance(value, class_)
+def _is_dataclass_instance(value: Any) -> bool:
+    return dataclasses.is_dataclass(value) and not isinstance(value, type)
+
+
+def _is_uuid(value: Any) -> bool:
+    # A UUID can't exist before the uuid module is imported, so the module doesn't have to be imported to check
+    return (uuid := sys.modules.get("uuid")) is not None and isinstance(value, uuid.UUID)
+
+
+def _module(name: str) -> Any:
+    # Optional JSON libraries are slow to import, simplejson imports decimal, so they're only imported once used
+    return sys.modules.get(name) or importlib.import_module(name)
+
+
+def _installed(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+
+class DataclassSerializer:
+    """
+    Shallow replacement for dataclasses.asdict, compiled once per dataclass from its fields. Unlike asdict,
+    field values aren't recursively copied, nested dataclasses are left for the JSON encoder to convert when
+    it reaches them, which produces the same JSON without walking and copying the whole structure twice.
+    """
+
+    def __init__(self, class_: type) -> None:
+        self.names = tuple(field.name for field in dataclasses.fields(class_))
+        self.getter: Callable[[Any], tuple[Any, ...]] = self._single_field
+        if len(self.names) > 1:
+            self.getter = attrgetter(*self.names)
 
-    return instance_checker
+    def __call__(self, value: Any) -> dict[str, Any]:
+        return dict(zip(self.names, self.getter(value)))
+
+    def _single_field(self, value: Any) -> tuple[Any, ...]:
+        return tuple(getattr(value, name) for name in self.names)
+
+
+_SERIALIZERS: dict[type, DataclassSerializer] = {}
+
+
+def to_dict(value: Any) -> dict[str, Any]:
+    """Converts a dataclass instance into a dict of its fields, without copying the field values."""
+    if not (serializer := _SERIALIZERS.get(type(value))):
+        serializer = _SERIALIZERS[type(value)] = DataclassSerializer(type(value))
+    return serializer(value)
+
+
+class EncoderRegistry:
+    """
+    Dispatch table of encoders for values that JSON libraries can't serialize natively. Encoders registered
+    for a type also apply to its subclasses, while matchers cover values that can't be identified by a single
+    base class, like dataclasses. The encoder for each concrete type is resolved once through its MRO and
+    cached, so encoding a value costs one dict lookup. Matchers are expected to only depend on the value type.
+    """
+
+    def __init__(self, encoders: dict[type, Encoder], matchers: list[tuple[TypeMatcher, Encoder]]) -> None:
+        self.encoders = encoders
+        self.matchers = matchers
+        self.resolved: dict[type, Encoder | None] = {}
+
+    def register(self, type_: type, encoder: Encoder) -> None:
+        self.encoders[type_] = encoder
+        self.resolved.clear()
+
+    def register_matcher(self, matcher: TypeMatcher, encoder: Encoder) -> None:
+        self.matchers.append((matcher, encoder))
+        self.resolved.clear()
+
+    def get(self, value: Any) -> Encoder | None:
+        try:
+            return self.resolved[type(value)]
+        except KeyError:
+            encoder = self.resolved[type(value)] = self._resolve(value)
+            return encoder
+
+    def _resolve(self, value: Any) -> Encoder | None:
+        for class_ in type(value).__mro__:
+            if encoder := self.encoders.get(class_):
+                return encoder
+        return next((encoder for matcher, encoder in self.matchers if matcher(value)), None)
 
 
 class DefaultEncoder(JSONEncoder):
-    ENCODERS: list[tuple[Callable[[Any], bool], Callable[[Any], Any]]] = [
-        (_instance_check(set), list),
-        (_instance_check(UUID), str),
-        (_instance_check(Enum), _enum_to_string),
-        (dataclasses.is_dataclass, dataclasses.asdict),
-    ]
+    ENCODERS = EncoderRegistry(
+        {set: list, Enum: _enum_to_string},
+        [(_is_dataclass_instance, to_dict), (_is_uuid, str)],
+    )
 
     def default(self, o: Any) -> Any:
-        for type_matcher, encoder in self.ENCODERS:
-            if type_matcher(o):
-                return encoder(o)
+        if encoder := self.ENCODERS.get(o):
+            return encoder(o)
         return super().default(o)
 
 
+def register_encoder(type_: type, encoder: Encoder) -> None:
+    """
+    Registers an encoder for a custom type, like datetime or Decimal, used by every JSON implementation, except for
+    decimals with UjsonJson, which always writes them as numbers.
+    """
+    DefaultEncoder.ENCODERS.register(type_, encoder)
+
+
+def encode(value: Any) -> Any:
+    """
+    Converts a value that isn't natively supported by a JSON library into one that is, using the exact same
+    rules as the DefaultEncoder. Meant to be passed as the "default" hook of third party JSON libraries.
+    """
+    if encoder := DefaultEncoder.ENCODERS.get(value):
+        return encoder(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
 class NativeJson(Json):
     @staticmethod
     def dumps(value: Any) -> str:
@@ -50,3 +151,53 @@ class NativeJson(Json):
     @staticmethod
     def loads(value: str) -> Any:
         return json.loads(value)
+
+
+class SimpleJson(Json):
+    """Decimals are left to the registered encoders, rather than written as numbers by simplejson."""
+
+    @staticmethod
+    def dumps(value: Any) -> str:
+        simplejson = _module("simplejson")
+        return str(
+            simplejson.dumps(value, default=encode, namedtuple_as_object=False, use_decimal=False, allow_nan=True)
+        )
+
+    @staticmethod
+    def loads(value: str) -> Any:
+        return _module("simplejson").loads(value, allow_nan=True)
+
+
+class UjsonJson(Json):
+    """
+    ujson writes decimals as numbers itself, so an encoder registered for Decimal is never called, unlike with every
+    other implementation. Encoders registered for the other types ujson can't serialize apply as usual.
+    """
+
+    @staticmethod
+    def dumps(value: Any) -> str:
+        return str(_module("ujson").dumps(value, default=encode, escape_forward_slashes=False))
+
+    @staticmethod
+    def loads(value: str) -> Any:
+        return _module("ujson").loads(value)
+
+
+def _select_fastest() -> Type[Json]:
+    """
+    Picks the installed JSON library with the least overhead per call, which matters most for many small documents
+    like log records, even if its output differs slightly from NativeJson, like the formatting of floats, or decimals
+    written as numbers by ujson.
+    """
+    candidates: list[tuple[str, Type[Json]]] = [("ujson", UjsonJson), ("simplejson", SimpleJson)]
+    return next((json_class for name, json_class in candidates if _installed(name)), NativeJson)
+
+
+def __getattr__(name: str) -> Any:
+    # orjson is slow to import and never selected automatically, so it's only imported once OrjsonJson is used
+    if name == "OrjsonJson":
+        return importlib.import_module("vial.orjson_json").OrjsonJson
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+FASTEST_JSON = _select_fastest()
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Awaitable, TypeVar
+
+if TYPE_CHECKING:
+    from asyncio import AbstractEventLoop
+
+T = TypeVar("T")
+
+
+class EventLoopRunner:
+    """
+    Runs coroutines from synchronous code on an event loop that's created once per thread and then reused by
+    every following invocation, unlike asyncio.run which creates and tears down a new loop on every call.
+    Loops are bound to the thread that created them, so invocations running in parallel threads never share one.
+    asyncio is only imported once the first loop is needed, as it's the slowest module to import by far.
+    """
+
+    def __init__(self) -> None:
+        self.local = threading.local()
+
+    @property
+    def loop(self) -> AbstractEventLoop:
+        loop: AbstractEventLoop | None = getattr(self.local, "loop", None)
+        if not loop or loop.is_closed():
+            import asyncio  # pylint: disable=import-outside-toplevel
+
+            loop = self.local.loop = asyncio.new_event_loop()
+        return loop
+
+    def run(self, awaitable: Awaitable[T]) -> T:
+        return self.loop.run_until_complete(awaitable)
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import cast
+from urllib import parse
+
+from vial.exceptions import NotFoundError, VialError
+
+
+@dataclass
+class Match:
+    route: str
+    path_params: dict[str, str]
+    query_params: dict[str, list[str]]
+
+
+class RouteMatcher:
+    def __init__(self, routes: list[str]) -> None:
+        self.routes = sorted(routes)
+
+    def match(self, url: str) -> Match:
+        parsed_url = parse.urlparse(url)
+        query_params = parse.parse_qs(parsed_url.query, keep_blank_values=True)
+        path = self._remove_trailing_slash(parsed_url.path)
+        return self._find_match(url, path.split("/"), query_params)
+
+    def _find_match(self, url: str, parts: list[str], query_params: dict[str, list[str]]) -> Match:
+        for route_url in self.routes:
+            url_parts = route_url.split("/")
+            if len(parts) != len(url_parts):
+                continue
+
+            if (path_params := self._match_path(parts, url_parts)) is not None:
+                return Match(route_url, path_params, query_params)
+        raise NotFoundError(VialError.ROUTE_NOT_FOUND.get(url))
+
+    @staticmethod
+    def _match_path(parts: list[str], url_parts: list[str]) -> dict[str, str] | None:
+        path_params: dict[str, str] = {}
+        for left, right in zip(parts, url_parts):
+            if right.startswith("{") and right.endswith("}"):
+                path_params[right[1:-1]] = left
+                continue
+
+            if left != right:
+                return None
+        return path_params
+
+    @staticmethod
+    def _remove_trailing_slash(path: str) -> str:
+        if path != "/" and path.endswith("/"):
+            return path[:-1]
+        return path
+
+
+class RouteNode:
+    """
+    A single path segment within a RouteTrie. Static children are keyed by their exact segment value, while all
+    variable segments at the same depth share one child regardless of the variable name used by each route.
+    """
+
+    __slots__ = ("static", "variable", "route", "names")
+
+    def __init__(self) -> None:
+        self.static: dict[str, RouteNode] = {}
+        self.variable: RouteNode | None = None
+        self.route: str | None = None
+        self.names: tuple[str, ...] = ()
+
+    @staticmethod
+    def is_variable(component: str) -> bool:
+        return component.startswith("{") and component.endswith("}")
+
+    def add(self, component: str) -> RouteNode:
+        if self.is_variable(component):
+            if not self.variable:
+                self.variable = RouteNode()
+            return self.variable
+        return self.static.setdefault(component, RouteNode())
+
+
+class RouteTrie:
+    """
+    Segment trie of route paths, built once so that matching a path only costs one dict lookup per segment
+    instead of a scan through every defined route. Static segments are always preferred over variable ones,
+    falling back to a variable segment only when the static branch can't match the rest of the path.
+    """
+
+    def __init__(self, routes: list[str]) -> None:
+        self.root = RouteNode()
+        for route in routes:
+            self.add(route)
+
+    def add(self, route: str) -> None:
+        node = self.root
+        names: list[str] = []
+        for component in route.split("/"):
+            if RouteNode.is_variable(component):
+                names.append(component[1:-1])
+            node = node.add(component)
+        node.route = route
+        node.names = tuple(names)
+
+    def find(self, parts: list[str]) -> tuple[str, dict[str, str]] | None:
+        values: list[str] = []
+        if not (node := self._search(self.root, parts, 0, values)):
+            return None
+        return cast(str, node.route), dict(zip(node.names, values))
+
+    def _search(self, node: RouteNode, parts: list[str], index: int, values: list[str]) -> RouteNode | None:
+        if index == len(parts):
+            return node if node.route is not None else None
+        if (child := node.static.get(parts[index])) and (found := self._search(child, parts, index + 1, values)):
+            return found
+        return self._search_variable(node, parts, index, values)
+
+    def _search_variable(self, node: RouteNode, parts: list[str], index: int, values: list[str]) -> RouteNode | None:
+        if not node.variable:
+            return None
+        values.append(parts[index])
+        if found := self._search(node.variable, parts, index + 1, values):
+            return found
+        values.pop()
+        return None
+
+
+class TrieRouteMatcher(RouteMatcher):
+    """
+    Route matcher backed by a RouteTrie, where matching time depends on the number of segments in the URL rather
+    than the number of routes defined within the application.
+    """
+
+    def __init__(self, routes: list[str]) -> None:
+        super().__init__(routes)
+        self.trie = RouteTrie(self.routes)
+
+    def _find_match(self, url: str, parts: list[str], query_params: dict[str, list[str]]) -> Match:
+        if not (found := self.trie.find(parts)):
+            raise NotFoundError(VialError.ROUTE_NOT_FOUND.get(url))
+        return Match(found[0], found[1], query_params)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import logging
+from logging import Handler, Logger, LogRecord
+from typing import Any
+
+from vial.instrumentation import Timings
+from vial.loggers import JsonFormatter, JsonLoggerFactory
+from vial.request import RequestContext
+from vial.types import Request, Response
+
+
+class Metrics:
+    """
+    Metrics collected during a single invocation, which are written out together as one CloudWatch Embedded Metric
+    Format document once the invocation completes. Counters are summed up, while recorded values are all kept,
+    leaving CloudWatch to aggregate them into statistics.
+    """
+
+    def __init__(self) -> None:
+        self.counters: dict[str, float] = {}
+        self.values: dict[str, list[float]] = {}
+        self.units: dict[str, str] = {}
+        self.dimensions: dict[str, str] = {}
+
+    def increment(self, name: str, value: float = 1, unit: str = "Count") -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+        self.units[name] = unit
+
+    def record(self, name: str, value: float, unit: str = "Milliseconds") -> None:
+        self.values.setdefault(name, []).append(value)
+        self.units[name] = unit
+
+    def add_dimension(self, name: str, value: str) -> None:
+        self.dimensions[name] = value
+
+    def to_document(self, namespace: str, timestamp: int) -> dict[str, Any]:
+        metrics: dict[str, Any] = {**self.counters, **self.values}
+        definition = {
+            "Namespace": namespace,
+            "Dimensions": [list(self.dimensions)],
+            "Metrics": [{"Name": name, "Unit": self.units[name]} for name in metrics],
+        }
+        return {"_aws": {"Timestamp": timestamp, "CloudWatchMetrics": [definition]}, **self.dimensions, **metrics}
+
+
+def get() -> Metrics:
+    """Returns the metrics of the current invocation, which can only be called during a lambda request."""
+    context = RequestContext.active()
+    if not context.metrics:
+        context.metrics = Metrics()
+    return context.metrics
+
+
+class MetricsFormatter(JsonFormatter):
+    """Writes metric documents logged as a dict as they are, instead of nesting them within a JSON log record."""
+
+    def format(self, record: LogRecord) -> str:
+        if isinstance(record.msg, dict):
+            return self.json.dumps(record.msg)
+        return super().format(record)
+
+
+class MetricsLoggerFactory(JsonLoggerFactory):
+    DEFAULT_LEVEL = logging.INFO
+
+    @classmethod
+    def get_level(cls) -> int:
+        """Metric documents are written at INFO whatever the configured log level, as they'd be lost otherwise."""
+        return cls.DEFAULT_LEVEL
+
+    @classmethod
+    def get_handler(cls) -> Handler:
+        handler = cls.handler_class()
+        handler.setFormatter(MetricsFormatter())
+        return handler
+
+
+class MetricsSink:
+    """
+    Instrumentation sink that writes the metrics of every invocation as a single EMF document, including its
+    latency and whether it failed with a client or a server error, dimensioned by the route, method and status.
+    The time spent in each phase of the invocation is only included when phase timings are enabled, as every
+    metric name is billed by CloudWatch as a separate custom metric.
+    """
+
+    def __init__(self, namespace: str, logger: Logger | None = None, phase_timings: bool = False) -> None:
+        self.namespace = namespace
+        self.logger = logger or MetricsLoggerFactory.get(f"{namespace}.metrics")
+        self.phase_timings = phase_timings
+
+    def __call__(self, request: Request, response: Response, timings: Timings) -> None:
+        context = RequestContext.active()
+        metrics = get()
+        status = int(response.status)
+        dimensions = {"Route": request.resource, "Method": request.method.name, "Status": str(status)}
+        metrics.dimensions = {**dimensions, **metrics.dimensions}
+        metrics.record("Latency", context.elapsed_time)
+        metrics.increment("ClientErrors", int(400 <= status < 500))
+        metrics.increment("ServerErrors", int(status >= 500))
+        if self.phase_timings:
+            for name, duration in timings.items():
+                metrics.record(name, duration / 1_000_000)
+        self.logger.info(metrics.to_document(self.namespace, int(context.start_time)))
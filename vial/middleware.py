@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import contextvars
+import inspect
 from collections import defaultdict
-from typing import Callable, Protocol
+from functools import partial
+from typing import Any, Awaitable, Callable, Protocol, TypeVar, Union, cast
 
+from vial.loops import EventLoopRunner
 from vial.types import Request, Response
 
 
@@ -11,28 +15,96 @@ class CallChain(Protocol):
         pass
 
 
+class AsyncCallChain(Protocol):
+    def __call__(self, event: Request) -> Awaitable[Response]:
+        pass
+
+
+Middleware = Union[Callable[[Request, CallChain], Response], Callable[[Request, AsyncCallChain], Awaitable[Response]]]
+
+M = TypeVar("M", bound=Middleware)
+
+
+def is_async(function: Callable[..., Any]) -> bool:
+    while isinstance(function, partial):  # Python 3.9 doesn't unwrap partials of bound methods
+        function = function.func
+    return inspect.iscoroutinefunction(function) or inspect.iscoroutinefunction(type(function).__call__)
+
+
 class MiddlewareChain:
-    def __init__(self, handler: Callable[[Request, CallChain], Response], next_call: CallChain) -> None:
+    def __init__(self, handler: Middleware, next_call: CallChain | AsyncCallChain) -> None:
         self.handler = handler
         self.next_call = next_call
 
+    def __call__(self, event: Request) -> Any:
+        return self.handler(event, self.next_call)  # type: ignore[arg-type]
+
+
+class SyncCall:
+    """Lets synchronous middleware call into an asynchronous part of the chain, blocking until it completes."""
+
+    def __init__(self, next_call: AsyncCallChain, runner: EventLoopRunner) -> None:
+        self.next_call = next_call
+        self.runner = runner
+
     def __call__(self, event: Request) -> Response:
-        return self.handler(event, self.next_call)
+        return self.runner.run(self.next_call(event))
+
+
+class AsyncCall:
+    """
+    Lets asynchronous middleware await a synchronous part of the chain. When that part of the chain calls into
+    asynchronous code again further down, it's run in a worker thread, as the event loop of the current thread
+    is already busy running the calling middleware.
+    """
+
+    def __init__(self, next_call: CallChain, threaded: bool) -> None:
+        self.next_call = next_call
+        self.threaded = threaded
+
+    async def __call__(self, event: Request) -> Response:
+        if not self.threaded:
+            return self.next_call(event)
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(None, context.run, self.next_call, event)
+
+
+def build_chain(
+    middleware: list[Middleware],
+    asynchronous: list[bool],
+    route_call: Callable[[Request], Any],
+    runner: EventLoopRunner,
+) -> CallChain:
+    """
+    Links the middleware and the route invocation into a single synchronous call chain. Synchronous and
+    asynchronous callables can be mixed freely, adapters are only inserted where the two meet. Whether each
+    middleware is a coroutine function, as told by is_async, is passed in so that it's only inspected once.
+    """
+    chain: Any = route_call
+    chain_is_async = contains_async = is_async(route_call)
+    for handler, handler_is_async in zip(reversed(middleware), reversed(asynchronous)):
+        if handler_is_async and not chain_is_async:
+            chain = AsyncCall(chain, contains_async)
+        elif chain_is_async and not handler_is_async:
+            chain = SyncCall(chain, runner)
+        chain = MiddlewareChain(handler, chain)
+        chain_is_async, contains_async = handler_is_async, contains_async or handler_is_async
+    return SyncCall(chain, runner) if chain_is_async else cast(CallChain, chain)
 
 
 class MiddlewareAPI:
     def __init__(self, name: str) -> None:
         super().__init__(name)  # type: ignore[call-arg] # https://github.com/python/mypy/issues/4335
         self.name = name
-        self.registered_middleware: dict[str, list[Callable[[Request, CallChain], Response]]] = defaultdict(list)
+        self.registered_middleware: dict[str, list[Middleware]] = defaultdict(list)
 
-    def middleware(
-        self, function: Callable[[Request, CallChain], Response]
-    ) -> Callable[[Request, CallChain], Response]:
+    def middleware(self, function: M) -> M:
         self.register_middleware(function)
         return function
 
-    def register_middleware(self, middleware: Callable[[Request, CallChain], Response]) -> None:
+    def register_middleware(self, middleware: Middleware) -> None:
         self.registered_middleware[self.name].append(middleware)
 
     def register_middlewares(self, other: MiddlewareAPI) -> None:
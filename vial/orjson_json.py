@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+
+from vial.json import Json, encode
+
+# Datetimes and dataclasses go through the registered encoders, like they do with the other implementations
+OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+class OrjsonJson(Json):
+    """
+    By far the fastest of the supported JSON libraries, but orjson always serializes enums by their value
+    rather than their name, so unlike the other implementations it isn't a drop in replacement for NativeJson
+    and is never selected automatically.
+    """
+
+    @staticmethod
+    def dumps(value: Any) -> str:
+        return orjson.dumps(value, default=encode, option=OPTIONS).decode("utf-8")
+
+    @staticmethod
+    def loads(value: str) -> Any:
+        return orjson.loads(value)
@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-from decimal import Decimal
+import importlib
 from typing import Any, Callable
-from uuid import UUID
 
 from vial.exceptions import ServerError, VialError
 from vial.types import T
@@ -21,8 +20,12 @@ class KeywordParser:
         "bool": bool,
         "int": int,
         "float": float,
-        "decimal": Decimal,
-        "uuid": UUID,
+    }
+
+    # Parsers of types that are slow to import, only imported once a route with a parameter of their type is registered
+    LAZY_PARSERS: dict[str, tuple[str, str]] = {
+        "decimal": ("decimal", "Decimal"),
+        "uuid": ("uuid", "UUID"),
     }
 
     def __init__(self) -> None:
@@ -30,11 +33,14 @@ class KeywordParser:
 
     def get(self, name: str) -> Parser:
         if not (parser := self.parsers.get(name)):
-            raise ServerError(VialError.PARSER_NOT_REGISTERED.get(name))
+            if name not in self.LAZY_PARSERS:
+                raise ServerError(VialError.PARSER_NOT_REGISTERED.get(name))
+            module_name, type_name = self.LAZY_PARSERS[name]
+            parser = self.parsers[name] = getattr(importlib.import_module(module_name), type_name)
         return parser
 
     def register(self, name: str, parser: Parser) -> None:
-        if name in self.parsers:
+        if name in self.parsers or name in self.LAZY_PARSERS:
             raise ServerError(VialError.PARSER_ALREADY_EXISTS.get(name))
         self.parsers[name] = parser
 
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from itertools import islice
+from typing import IO, Any, Iterable, Iterator, Sequence
+
+from vial.app import Vial
+from vial.server import Statistics, build_context, format_report, initialize_worker, load_app
+
+Event = dict[str, Any]
+
+COMPARED_FIELDS = ("statusCode", "headers", "body", "isBase64Encoded")
+
+
+@dataclass
+class Result:
+    route: str
+    duration: int
+    response: dict[str, Any]
+
+
+@dataclass
+class Difference:
+    index: int
+    route: str
+    fields: dict[str, tuple[Any, Any]]
+
+
+def read_events(lines: Iterable[str]) -> Iterator[Event]:
+    """Parses API Gateway events from JSON lines one at a time, so event files never have to fit in memory."""
+    return (json.loads(line) for line in lines if line.strip())
+
+
+def batched(events: Iterable[Event], size: int) -> Iterator[list[Event]]:
+    iterator = iter(events)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def replay_events(app: Vial, events: list[Event]) -> list[Result]:
+    results = []
+    for event in events:
+        context = build_context(app.name)
+        started = time.perf_counter_ns()
+        response = app(event, context)
+        results.append(Result(event["resource"], time.perf_counter_ns() - started, response))
+    return results
+
+
+def replay_batch(path: str, events: list[Event]) -> list[Result]:
+    return replay_events(load_app(path), events)
+
+
+class Replayer:
+    """
+    Replays captured API Gateway events against an application, in batches of events rather than one event at a
+    time, so that the overhead of handing them to the workers is spread over many invocations. Batches are replayed
+    in the current process, or in a pool of processes that each import the application. At most two batches per
+    process are queued at once, as the events are streamed rather than loaded up front. Results are returned in the
+    order of the events, and the latency of every invocation is recorded by route.
+    """
+
+    def __init__(self, path: str, batch_size: int = 100, processes: int = 0) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self.processes = processes
+        self.statistics = Statistics()
+
+    def replay(self, events: Iterable[Event]) -> Iterator[Result]:
+        batches = batched(events, self.batch_size)
+        results = self._replay_pooled(batches) if self.processes else map(partial(replay_batch, self.path), batches)
+        started = time.perf_counter_ns()
+        try:
+            for batch in results:
+                for result in batch:
+                    self.statistics.record(result.route, result.duration, result.response["statusCode"])
+                    yield result
+        finally:
+            # Results are only recorded once their whole batch is done, so the throughput is measured from here
+            self.statistics.extend(started, time.perf_counter_ns())
+
+    def _replay_pooled(self, batches: Iterator[list[Event]]) -> Iterator[list[Result]]:
+        with ProcessPoolExecutor(self.processes, initializer=initialize_worker, initargs=(self.path,)) as executor:
+            pending: deque[Future[list[Result]]] = deque()
+            for batch in batches:
+                pending.append(executor.submit(replay_batch, self.path, batch))
+                if len(pending) >= self.processes * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+
+def normalize(response: dict[str, Any], ignored_headers: frozenset[str] = frozenset()) -> dict[str, Any]:
+    """Returns the compared fields of a response, leaving out headers like dates that differ between invocations."""
+    headers = {name.lower(): value for name, value in response.get("headers", {}).items()}
+    return {
+        "statusCode": int(response["statusCode"]),
+        "headers": {name: value for name, value in headers.items() if name not in ignored_headers},
+        "body": response.get("body"),
+        "isBase64Encoded": response.get("isBase64Encoded", False),
+    }
+
+
+def compare(expected: dict[str, Any], actual: dict[str, Any]) -> dict[str, tuple[Any, Any]]:
+    """Returns the expected and actual values of every field that differs between two normalized responses."""
+    return {name: (expected[name], actual[name]) for name in COMPARED_FIELDS if expected[name] != actual[name]}
+
+
+def parse_arguments(arguments: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m vial.replay", description="Replays captured events locally.")
+    parser.add_argument("app", help='application to replay against, as "module:attribute"')
+    parser.add_argument("events", type=argparse.FileType("r"), help="API Gateway events, one JSON document per line")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--processes", type=int, default=0, help="replay in a pool of processes instead of inline")
+    parser.add_argument("--record", type=argparse.FileType("w"), help="write the responses as a new baseline")
+    parser.add_argument("--baseline", type=argparse.FileType("r"), help="compare the responses with a baseline")
+    parser.add_argument("--ignore-header", action="append", default=[], help="header left out of the comparison")
+    return parser.parse_args(arguments)
+
+
+def diff(results: Iterable[Result], baseline: IO[str], ignored_headers: frozenset[str]) -> Iterator[Difference]:
+    """Compares the responses with the baseline, recorded in the same order from the same events."""
+    expected_responses = read_events(baseline)
+    for index, result in enumerate(results):
+        actual = normalize(result.response, ignored_headers)
+        if (expected := next(expected_responses, None)) is None:
+            yield Difference(index, result.route, {"response": (None, actual)})
+        elif fields := compare(normalize(expected, ignored_headers), actual):
+            yield Difference(index, result.route, fields)
+
+
+def record(results: Iterable[Result], output: IO[str]) -> Iterator[Result]:
+    for result in results:
+        output.write(json.dumps(normalize(result.response)) + "\n")
+        yield result
+
+
+def format_differences(differences: list[Difference], limit: int = 200) -> str:
+    lines = [f"{len(differences)} responses differ from the baseline"] if differences else []
+    for difference in differences:
+        for name, (expected, actual) in difference.fields.items():
+            line = f"#{difference.index} {difference.route} {name}: expected {expected!r}, got {actual!r}"
+            lines.append(line[:limit])
+    return "".join(f"{line}\n" for line in lines)
+
+
+def check(results: Iterable[Result], options: argparse.Namespace) -> list[Difference]:
+    if not options.baseline:
+        deque(results, maxlen=0)  # Only the latencies are reported without a baseline
+        return []
+    ignored_headers = frozenset(name.lower() for name in options.ignore_header)
+    return list(diff(results, options.baseline, ignored_headers))
+
+
+def main(arguments: Sequence[str] | None = None) -> int:
+    """Replays the events and writes a latency report to stdout, failing when a response differs from the baseline."""
+    options = parse_arguments(arguments)
+    replayer = Replayer(options.app, options.batch_size, options.processes)
+    results = replayer.replay(read_events(options.events))
+    differences = check(record(results, options.record) if options.record else results, options)
+    if options.record:
+        options.record.close()
+    sys.stdout.write(format_report(replayer.statistics.summarize()))
+    sys.stdout.write(format_differences(differences))
+    return 1 if differences else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -1,39 +1,61 @@
 from __future__ import annotations
 
-from typing import Any
+import time
+from contextvars import ContextVar, Token, copy_context
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, TypeVar, cast
 
-from vial import timestamps
 from vial.exceptions import ServerError, VialError
 from vial.types import Request
 
+if TYPE_CHECKING:
+    from vial.metrics import Metrics
+
+T = TypeVar("T")
+
 
 class RequestContext:
-    _INSTANCE: RequestContext | None = None
+    """
+    The active request is held in a context variable rather than a global, so every thread and asyncio task sees
+    the request it's serving, which allows invoking the same application in parallel within a single process.
+    """
+
+    _INSTANCE: ContextVar[RequestContext | None] = ContextVar("vial_request_context", default=None)
 
     def __init__(self, request: Request) -> None:
         self.request = request
-        self.start_time = timestamps.epoch_millis()
+        self.start_time = time.time() * 1000
+        self.start_counter = time.perf_counter_ns()
+        self.token: Token[RequestContext | None] | None = None
+        self.metrics: Metrics | None = None
+        self.sampled = False
 
     @property
     def elapsed_time(self) -> float:
-        return timestamps.epoch_millis() - self.start_time
+        return (time.perf_counter_ns() - self.start_counter) / 1_000_000
 
     @property
     def remaining_time(self) -> int:
         return self.request.context.get_remaining_time_in_millis()
 
     def __enter__(self) -> RequestContext:
-        RequestContext._INSTANCE = self
+        self.token = RequestContext._INSTANCE.set(self)
         return self
 
     def __exit__(self, *_: Any) -> None:
-        RequestContext._INSTANCE = None
+        if self.token:
+            RequestContext._INSTANCE.reset(self.token)
+            self.token = None
+
+    @classmethod
+    def current(cls) -> RequestContext | None:
+        return cls._INSTANCE.get()
 
     @classmethod
     def active(cls) -> RequestContext:
-        if not cls._INSTANCE:
+        if not (context := cls._INSTANCE.get()):
             raise ServerError(VialError.NOT_IN_REQUEST.get())
-        return cls._INSTANCE
+        return context
 
 
 def get() -> Request:
@@ -46,3 +68,12 @@ def elapsed_time() -> float:
 
 def remaining_time() -> int:
     return RequestContext.active().remaining_time
+
+
+def propagate(function: Callable[..., T]) -> Callable[..., T]:
+    """
+    Binds a function to a copy of the current context, so the active request remains available when it's run
+    by a thread pool, like executor.submit(request.propagate(function), *args). Threads started by the executor
+    don't inherit the context of the submitting thread otherwise.
+    """
+    return cast(Callable[..., T], partial(copy_context().run, function))
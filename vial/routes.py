@@ -5,9 +5,10 @@ from dataclasses import dataclass
 from typing import Any, Callable, Iterable
 
 from vial.parsers import KeywordParser, Parser
-from vial.types import HTTPMethod, T
+from vial.types import HTTPMethod, T, slotted
 
 
+@slotted
 @dataclass(frozen=True)
 class Route:
     resource: str
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import argparse
+import base64
+import importlib
+import signal
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import chain
+from typing import Any, Callable, Sequence, cast
+
+from vial.app import Vial
+from vial.exceptions import NotFoundError
+from vial.gateway import Gateway
+from vial.types import HTTPMethod, LambdaContext
+
+Invocation = Callable[..., dict[str, Any]]
+
+TOTAL = "*"
+
+UNMATCHED = "-"
+
+
+@lru_cache(maxsize=None)
+def load_app(path: str) -> Vial:
+    """Imports an application from a "module:attribute" path, the attribute defaulting to "app"."""
+    module_name, _, name = path.partition(":")
+    return cast(Vial, getattr(importlib.import_module(module_name), name or "app"))
+
+
+def build_context(name: str) -> LambdaContext:
+    """Builds the context of a single invocation of a local function, with a unique request ID."""
+    arn = f"arn:aws:lambda:local:000000000000:function:{name}"
+    return LambdaContext(name, "$LATEST", arn, 128, str(uuid.uuid4()), f"/aws/lambda/{name}", "local")
+
+
+def initialize_worker(path: str) -> None:
+    """Loads the application before the first invocation, leaving interrupts for the server process to handle."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    load_app(path)
+
+
+def invoke_app(path: str, event: dict[str, Any], context: LambdaContext) -> dict[str, Any]:
+    return load_app(path)(event, context)
+
+
+class Invoker:
+    """Runs invocations of an application on a pool of workers, each worker standing in for one Lambda instance."""
+
+    def __init__(self, executor: Executor, invocation: Invocation, *args: Any) -> None:
+        self.executor = executor
+        self.invocation = invocation
+        self.args = args
+
+    def __call__(self, event: dict[str, Any], context: LambdaContext) -> dict[str, Any]:
+        return self.executor.submit(self.invocation, *self.args, event, context).result()
+
+    def shutdown(self) -> None:
+        self.executor.shutdown()
+
+
+class ThreadInvoker(Invoker):
+    """
+    Shares one application between a pool of threads. The application is frozen up front, rather than by whichever
+    thread happens to receive the first request.
+    """
+
+    def __init__(self, app: Vial, workers: int) -> None:
+        if not app.frozen:
+            app.freeze()
+        super().__init__(ThreadPoolExecutor(workers, thread_name_prefix=f"{app.name}-worker"), app)
+
+
+class ProcessInvoker(Invoker):
+    """
+    Imports the application into every process of a pool, so invocations don't contend for the GIL and module
+    level state isn't shared between them, like separate Lambda instances.
+    """
+
+    def __init__(self, path: str, workers: int) -> None:
+        super().__init__(
+            ProcessPoolExecutor(workers, initializer=initialize_worker, initargs=(path,)), invoke_app, path
+        )
+
+
+@dataclass
+class Summary:
+    """Latencies are in milliseconds, throughput is the number of requests per second."""
+
+    requests: int
+    errors: int
+    throughput: float
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+    @classmethod
+    def of(cls, latencies: list[int], errors: int, elapsed: int) -> Summary:
+        ordered = sorted(latencies)
+        millis = [latency / 1_000_000 for latency in ordered]
+        throughput = len(ordered) / (elapsed / 1_000_000_000) if elapsed else 0.0
+        p50, p90, p99 = (millis[min(len(millis) - 1, int(len(millis) * rank))] for rank in (0.5, 0.9, 0.99))
+        return cls(len(ordered), errors, throughput, sum(millis) / len(millis), p50, p90, p99, millis[-1])
+
+
+class Statistics:
+    """Thread safe record of the latency of every request, grouped by route. Server errors are counted as errors."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.latencies: dict[str, list[int]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.started: int | None = None
+        self.finished = 0
+
+    def record(self, route: str, duration: int, status: int) -> None:
+        """Records a request that just completed after the given number of nanoseconds."""
+        finished = time.perf_counter_ns()
+        self.extend(finished - duration, finished)
+        with self.lock:
+            self.latencies[route].append(duration)
+            self.errors[route] += status >= HTTPStatus.INTERNAL_SERVER_ERROR
+
+    def extend(self, started: int, finished: int) -> None:
+        """
+        Widens the measured period to cover the given one, for requests that are recorded some time after they ran,
+        like the ones replayed in batches, whose durations alone can't tell how long the whole run took.
+        """
+        with self.lock:
+            self.started = started if self.started is None else min(self.started, started)
+            self.finished = max(self.finished, finished)
+
+    def summarize(self) -> dict[str, Summary]:
+        """
+        Returns a summary of every route, as well as of all the requests combined under the TOTAL key. Requests that
+        didn't match any route are grouped under the UNMATCHED key.
+        """
+        with self.lock:
+            if not self.latencies:
+                return {}
+            elapsed = self.finished - cast(int, self.started)
+            summaries = {TOTAL: Summary.of(list(chain(*self.latencies.values())), sum(self.errors.values()), elapsed)}
+            for route, latencies in sorted(self.latencies.items()):
+                summaries[route] = Summary.of(latencies, self.errors[route], elapsed)
+            return summaries
+
+
+def format_report(summaries: dict[str, Summary]) -> str:
+    headers = ("route", "requests", "errors", "req/s", "mean ms", "p50 ms", "p90 ms", "p99 ms", "max ms")
+    rows = [headers] + [_format_row(route, summary) for route, summary in summaries.items()]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(headers))]
+    return "\n".join("  ".join(value.rjust(width) for value, width in zip(row, widths)) for row in rows) + "\n"
+
+
+def _format_row(route: str, summary: Summary) -> tuple[str, ...]:
+    values = (summary.throughput, summary.mean, summary.p50, summary.p90, summary.p99, summary.max)
+    return (route, str(summary.requests), str(summary.errors), *(f"{value:.2f}" for value in values))
+
+
+class LocalServer(ThreadingHTTPServer):
+    """
+    HTTP server standing in for API Gateway in front of an application, for local development and load testing.
+    Requests are converted into API Gateway proxy events with the route table of the application, and invoked
+    through the invoker, which bounds the number of concurrent invocations to its number of workers.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], app: Vial, invoker: Invoker) -> None:
+        super().__init__(address, LocalRequestHandler)
+        self.app = app
+        self.gateway = Gateway(app)
+        self.invoker = invoker
+        self.statistics = Statistics()
+
+
+class LocalRequestHandler(BaseHTTPRequestHandler):
+    server: LocalServer
+
+    # Keeps connections open between requests, as load testing tools expect
+    protocol_version = "HTTP/1.1"
+
+    def handle_method(self) -> None:
+        started = time.perf_counter_ns()
+        try:
+            event = self.build_event()
+        except NotFoundError:
+            self.server.statistics.record(UNMATCHED, time.perf_counter_ns() - started, HTTPStatus.NOT_FOUND)
+            self.write_response(HTTPStatus.NOT_FOUND, {"Content-Type": "application/json"}, b'{"message":"Not Found"}')
+            return
+        response = self.server.invoker(event, build_context(self.server.app.name))
+        status = response["statusCode"]
+        self.server.statistics.record(event["resource"], time.perf_counter_ns() - started, status)
+        self.write_response(status, response["headers"], self.get_body(response))
+
+    do_GET = do_PUT = do_PATCH = do_POST = do_DELETE = do_OPTIONS = do_TRACE = handle_method
+
+    def build_event(self) -> dict[str, Any]:
+        headers: dict[str, str | list[str]] = defaultdict(list)
+        for name, value in self.headers.items():
+            cast(list[str], headers[name]).append(value)
+        return self.server.gateway.build_request(HTTPMethod[self.command], self.path, self.read_body(), headers)
+
+    def read_body(self) -> str | bytes | None:
+        if not (body := self.rfile.read(int(self.headers.get("Content-Length") or 0))):
+            return None
+        try:
+            return body.decode("utf-8")
+        except UnicodeDecodeError:
+            return body  # Sent base64 encoded, like API Gateway does with binary bodies
+
+    @staticmethod
+    def get_body(response: dict[str, Any]) -> bytes:
+        if not (body := response.get("body")):
+            return b""
+        return base64.b64decode(body) if response.get("isBase64Encoded") else cast(str, body).encode("utf-8")
+
+    def write_response(self, status: int, headers: dict[str, str], body: bytes) -> None:
+        self.send_response(status)
+        for name, value in headers.items():
+            if name.lower() != "content-length":
+                self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+        pass  # Access logs would slow down every request and drown out the application logs
+
+
+def parse_arguments(arguments: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m vial.server", description="Serves a Vial application locally.")
+    parser.add_argument("app", help='application to serve, as "module:attribute", the attribute defaulting to "app"')
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=4, help="maximum number of concurrent invocations")
+    parser.add_argument("--processes", action="store_true", help="run invocations in processes instead of threads")
+    return parser.parse_args(arguments)
+
+
+def main(arguments: Sequence[str] | None = None) -> None:
+    """Serves an application until interrupted, then writes a report of the latencies of every route to stderr."""
+    options = parse_arguments(arguments)
+    app = load_app(options.app)
+    invoker = ProcessInvoker(options.app, options.workers) if options.processes else ThreadInvoker(app, options.workers)
+    server = LocalServer((options.host, options.port), app, invoker)
+    sys.stderr.write(f"Serving {options.app} on http://{options.host}:{server.server_port}\n")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        invoker.shutdown()
+        sys.stderr.write(format_report(server.statistics.summarize()))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
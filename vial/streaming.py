@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from itertools import islice
+from typing import Any, Iterable, Iterator, Protocol
+
+from vial.json import Json
+from vial.types import Response, StreamingResponse
+
+PRELUDE_DELIMITER = b"\x00" * 8
+
+
+class ResponseWriter(Protocol):
+    def write(self, chunk: bytes) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class BufferedResponseWriter(ResponseWriter):
+    """
+    Local stand-in for the Lambda response stream, which keeps every written chunk in memory.
+    Meant for tests and local development only.
+    """
+
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+        self.closed = False
+
+    def write(self, chunk: bytes) -> None:
+        self.chunks.append(chunk)
+
+    def close(self) -> None:
+        self.closed = True
+
+    def read(self) -> tuple[bytes, bytes]:
+        """Splits the written stream into the prelude with the status and headers, and the response body."""
+        prelude, _, body = b"".join(self.chunks).partition(PRELUDE_DELIMITER)
+        return prelude, body
+
+
+def encode_items(json: Json, items: Iterable[Any], chunk_size: int) -> Iterator[str]:
+    """Encodes the items as a JSON array, yielding one chunk of the array for every chunk_size items."""
+    iterator = iter(items)
+    separator = ""
+    yield "["
+    while chunk := list(islice(iterator, chunk_size)):
+        yield separator + ",".join(map(json.dumps, chunk))
+        separator = ","
+    yield "]"
+
+
+def encode_stream(json: Json, response: Response) -> Iterator[bytes]:
+    if isinstance(response.body, bytes):
+        yield response.body
+    else:
+        yield from (chunk.encode("utf-8") for chunk in encode_body(json, response))
+
+
+def encode_body(json: Json, response: Response) -> Iterator[str]:
+    if isinstance(response, StreamingResponse):
+        yield from encode_items(json, response.items, response.chunk_size)
+    elif isinstance(response.body, str):
+        yield response.body
+    elif response.body is not None:
+        yield json.dumps(response.body)
+
+
+def encode_prelude(json: Json, response: Response) -> bytes:
+    """
+    Lambda HTTP response streams start with a JSON prelude holding the status code and headers of the response,
+    separated from the response body by 8 null bytes.
+    """
+    prelude = json.dumps({"statusCode": response.status, "headers": response.headers})
+    return prelude.encode("utf-8") + PRELUDE_DELIMITER
@@ -1,15 +1,45 @@
 from __future__ import annotations
 
+import base64
+import dataclasses
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from http import HTTPStatus
-from typing import Any, Iterator, MutableMapping, TypeVar
+from typing import Any, Iterable, Iterator, MutableMapping, Optional, Type, TypeVar, cast
 
 T = TypeVar("T")
 K = TypeVar("K")
 V = TypeVar("V")
 
 
+def slotted(class_: Type[T]) -> Type[T]:
+    """
+    Recreates a dataclass with __slots__ for its fields, like dataclass(slots=True) does from Python 3.10 onwards, so
+    its instances don't carry a __dict__, which makes them smaller and cheaper to allocate. Fields already stored in
+    the slots of a base class aren't declared again. Frozen dataclasses are pickled through their field values, as
+    the default pickling of slots can't assign them.
+    """
+    names = [field.name for field in dataclasses.fields(cast(Any, class_))]
+    inherited = {name for base in class_.__mro__[1:] for name in base.__dict__.get("__slots__", ())}
+    excluded = {*names, "__dict__", "__weakref__"}
+    namespace = {name: value for name, value in class_.__dict__.items() if name not in excluded}
+    namespace["__slots__"] = tuple(name for name in names if name not in inherited)
+    if class_.__dataclass_params__.frozen:  # type: ignore[attr-defined]
+        namespace["__getstate__"] = _get_fields
+        namespace["__setstate__"] = _set_fields
+    metaclass: Any = type(class_)
+    return cast(Type[T], metaclass(class_.__name__, class_.__bases__, namespace))
+
+
+def _get_fields(instance: Any) -> list[Any]:
+    return [getattr(instance, field.name) for field in dataclasses.fields(instance)]
+
+
+def _set_fields(instance: Any, values: list[Any]) -> None:
+    for field_, value in zip(dataclasses.fields(instance), values):
+        object.__setattr__(instance, field_.name, value)
+
+
 class MultiDict(MutableMapping[K, list[V]]):  # pylint: disable=too-many-ancestors
     def __init__(self, values: dict[K, list[V]] | None = None) -> None:
         super().__init__()
@@ -77,6 +107,7 @@ class ClientContext:
     env: dict[str, Any]
 
 
+@slotted
 @dataclass
 class LambdaContext:
     function_name: str
@@ -108,12 +139,14 @@ class HTTPMethod(Enum):
     TRACE = auto()
 
 
+@slotted
 @dataclass
 class LambdaEvent:
     event: dict[str, Any]
     context: LambdaContext
 
 
+@slotted
 @dataclass
 class Request(LambdaEvent):
     method: HTTPMethod
@@ -123,9 +156,98 @@ class Request(LambdaEvent):
     query_parameters: MultiDict[str, str]
     body: str | None
 
+    @property
+    def raw_body(self) -> memoryview | None:
+        return memoryview(self.body.encode("utf-8")) if self.body is not None else None
+
+
+class LazyRequest(Request):
+    """
+    Request built directly on top of the raw Lambda event, where every field is only decoded from the event
+    when it's first accessed and then cached. Requests that are rejected before reaching a route handler,
+    like the ones without a matching route, then never pay for parsing headers, query parameters or the body.
+
+    Decoded fields are cached in the slots inherited from Request, which are left empty until then. Reading an
+    empty slot falls back to __getattr__, which decodes the field and fills its slot, so following reads are
+    plain slot reads and instances don't need a __dict__.
+    """
+
+    __slots__ = ("raw_body",)
+
+    raw_body: memoryview | None
+
+    def __init__(self, event: dict[str, Any], context: LambdaContext) -> None:  # pylint: disable=super-init-not-called
+        self.event = event
+        self.context = context
+
+    def __getattr__(self, name: str) -> Any:
+        if not (decode := getattr(type(self), f"_decode_{name}", None)):
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        value = decode(self)
+        setattr(self, name, value)
+        return value
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Copies are rebuilt from the event, as the default reduction would read, and so decode, every slot
+        return LazyRequest, (self.event, self.context)
+
+    def _decode_method(self) -> HTTPMethod:
+        return HTTPMethod[self.event["httpMethod"]]
 
+    def _decode_resource(self) -> str:
+        return str(self.event["resource"])
+
+    def _decode_path(self) -> str:
+        return str(self.event["path"])
+
+    def _decode_headers(self) -> MultiDict[str, str]:
+        return MultiDict(self.event["multiValueHeaders"])
+
+    def _decode_query_parameters(self) -> MultiDict[str, str]:
+        return MultiDict(self.event["multiValueQueryStringParameters"])
+
+    def _decode_body(self) -> str | None:
+        if self.event.get("isBase64Encoded") and (raw_body := self.raw_body):
+            return str(raw_body, "utf-8")
+        return cast(Optional[str], self.event["body"])
+
+    def _decode_raw_body(self) -> memoryview | None:
+        """
+        The request body as bytes, decoded from base64 without going through a string, which makes it suitable
+        for binary payloads. Backed by a memoryview so that slicing it doesn't copy the underlying bytes.
+        """
+        if (body := self.event["body"]) is None:
+            return None
+        if self.event.get("isBase64Encoded"):
+            return memoryview(base64.b64decode(body))
+        return memoryview(body.encode("utf-8"))
+
+
+@slotted
 @dataclass
 class Response:
-    body: dict[str, Any] | list[Any] | str | None = None
+    body: dict[str, Any] | list[Any] | str | bytes | None = None
     headers: dict[str, str] = field(default_factory=dict)
     status: HTTPStatus | int = HTTPStatus.OK
+
+
+class StreamingResponse(Response):
+    """
+    A response whose body is an iterable of items, encoded incrementally as a JSON array instead of being
+    materialized and serialized all at once. Items are consumed lazily, chunk_size items at a time.
+    """
+
+    __slots__ = ("items", "chunk_size")
+
+    DEFAULT_CHUNK_SIZE = 100
+
+    def __init__(
+        self,
+        items: Iterable[Any],
+        headers: dict[str, str] | None = None,
+        status: HTTPStatus | int = HTTPStatus.OK,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        super().__init__(None, headers if headers is not None else {}, status)
+        self.items = items
+        self.chunk_size = chunk_size